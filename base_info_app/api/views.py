@@ -5,12 +5,39 @@ This module provides API views for retrieving aggregate statistics and base
 information about the application, including review counts, ratings, and user statistics.
 """
 
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Avg, Count, Q
 from rest_framework import permissions
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
+from offers_app.models import Offer
+from reviews_app.models import Review
+from user_auth_app.models import UserProfile
+
 from .serializers import BaseInfo
 
+BASE_INFO_CACHE_KEY = 'baseinfo:v1'
+BASE_INFO_CACHE_TIMEOUT = 60
+
+
+def get_base_info_stats():
+    """Collect the application statistics with one aggregate query per table in a single transaction."""
+    with transaction.atomic():
+        review_stats = Review.objects.aggregate(review_count=Count('id'), average_rating=Avg('rating'))
+        profile_stats = UserProfile.objects.aggregate(
+            business_profile_count=Count('pk', filter=Q(type='business'))
+        )
+        offer_count = Offer.objects.count()
+    average_rating = review_stats['average_rating']
+    return {
+        'review_count': review_stats['review_count'],
+        'average_rating': round(average_rating, 2) if average_rating is not None else 0.0,
+        'business_profile_count': profile_stats['business_profile_count'],
+        'offer_count': offer_count,
+    }
+
 
 class BaseInfoListAPIView(APIView):
     """API view for retrieving base application statistics."""
@@ -18,8 +45,6 @@ class BaseInfoListAPIView(APIView):
     permission_classes = [permissions.AllowAny]
 
     def get(self, request):
-        """Retrieve base application statistics."""
-        serializer = BaseInfo(instance={}, many=False)
-        return Response(serializer.data)
-
-
+        """Retrieve base application statistics, served from cache when available."""
+        stats = cache.get_or_set(BASE_INFO_CACHE_KEY, get_base_info_stats, BASE_INFO_CACHE_TIMEOUT)
+        return Response(stats)
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class BaseInfoAppConfig(AppConfig):
     name = 'base_info_app'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from offers_app.models import Offer, delete_cache_on_commit
+from reviews_app.models import Review
+from user_auth_app.models import UserProfile
+
+from .api.views import BASE_INFO_CACHE_KEY
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+@receiver(post_save, sender=Offer)
+@receiver(post_delete, sender=Offer)
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_base_info(sender, **kwargs):
+    """Drop the cached base-info statistics once a change to a counted model commits."""
+    delete_cache_on_commit(BASE_INFO_CACHE_KEY)
@@ -0,0 +1,69 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from offers_app.models import Offer
+from reviews_app.models import Review
+
+User = get_user_model()
+
+pytestmark = pytest.mark.django_db
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+@pytest.fixture
+def business_user():
+    return User.objects.create_user(
+        username='business_user',
+        email='business@example.com',
+        password='testpass123',
+        type='business'
+    )
+
+@pytest.fixture
+def customer_user():
+    return User.objects.create_user(
+        username='customer_user',
+        email='customer@example.com',
+        password='testpass123',
+        type='customer'
+    )
+
+# GET /api/base-info/ Tests
+class TestBaseInfo:
+    def test_base_info_empty(self, api_client):
+        url = reverse('baseinfo-list')
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {
+            'review_count': 0,
+            'average_rating': 0.0,
+            'business_profile_count': 0,
+            'offer_count': 0,
+        }
+
+    def test_base_info_counts(self, api_client, business_user, customer_user):
+        Offer.objects.create(user=business_user, title="Test Offer", description="Test Description")
+        Review.objects.create(business_user=business_user, reviewer=customer_user, rating=4, description="Good")
+        Review.objects.create(business_user=business_user, reviewer=business_user, rating=5, description="Great")
+        url = reverse('baseinfo-list')
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['review_count'] == 2
+        assert response.data['average_rating'] == 4.5
+        assert response.data['business_profile_count'] == 1
+        assert response.data['offer_count'] == 1
+
+    def test_base_info_cache_invalidated_on_change(self, api_client, business_user, django_capture_on_commit_callbacks):
+        url = reverse('baseinfo-list')
+        assert api_client.get(url).data['offer_count'] == 0
+        with django_capture_on_commit_callbacks(execute=True):
+            offer = Offer.objects.create(user=business_user, title="Test Offer", description="Test Description")
+            assert api_client.get(url).data['offer_count'] == 0
+        assert api_client.get(url).data['offer_count'] == 1
+        with django_capture_on_commit_callbacks(execute=True):
+            offer.delete()
+        assert api_client.get(url).data['offer_count'] == 0
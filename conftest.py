@@ -0,0 +1,17 @@
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+
+
+@pytest.fixture(autouse=True, scope='session')
+def fast_password_hasher():
+    """Hash test passwords with MD5; PBKDF2 dominates the cost of every create_user() in the suite."""
+    with override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher']):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with an empty cache so cached counts never leak between tests."""
+    cache.clear()
+    yield
@@ -0,0 +1,18 @@
+"""
+Shared API renderers module.
+
+This module provides a JSON renderer backed by orjson for the project's API endpoints.
+"""
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSON renderer using orjson, falling back to DRF's encoder for types orjson does not know."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return orjson.dumps(data, default=JSONEncoder().default)
@@ -0,0 +1,34 @@
+"""
+Shared serialization helpers module.
+
+This module renders read-only list endpoints straight from database rows,
+skipping model instantiation and DRF's per-field serializer machinery.
+"""
+
+from rest_framework import serializers
+
+ROWS_CHUNK_SIZE = 2000
+_datetime_field = serializers.DateTimeField()
+
+
+def format_datetime(value):
+    """Format a datetime exactly like DRF's DateTimeField renders it."""
+    return _datetime_field.to_representation(value)
+
+
+def rows_to_dicts(queryset, keys, columns, datetime_keys=()):
+    """
+    Render a queryset as a list of dicts from plain column tuples.
+
+    columns are read with values_list() and renamed to keys, in order; values under
+    datetime_keys are formatted by DRF's DateTimeField. Rows are streamed in chunks
+    so the queryset never caches the full result next to the rendered list.
+    """
+    data = []
+    for row in queryset.values_list(*columns).iterator(chunk_size=ROWS_CHUNK_SIZE):
+        item = dict(zip(keys, row))
+        for key in datetime_keys:
+            if item[key] is not None:
+                item[key] = format_datetime(item[key])
+        data.append(item)
+    return data
@@ -128,6 +128,19 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing
+# https://docs.djangoproject.com/en/6.0/topics/auth/passwords/#using-argon2-with-django
+# Argon2 hashes at a fraction of PBKDF2's CPU time per registration/login; the
+# remaining hashers keep existing passwords valid and upgrade them on next login.
+
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
 # Custom User Model
 AUTH_USER_MODEL = 'user_auth_app.UserProfile'
 
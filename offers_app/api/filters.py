@@ -6,7 +6,7 @@ based on various criteria like price, delivery time, and creator.
 """
 
 import django_filters
-from django.db.models import Min
+from rest_framework import filters
 
 from ..models import Offer
 
@@ -23,12 +23,22 @@ class OfferFilter(django_filters.FilterSet):
 
     def filter_min_price(self, queryset, name, value):
         """Filter offers by minimum price across their offer details."""
-        return queryset.annotate(min_price=Min('details__price')).filter(min_price__gte=value)
+        return queryset.filter(min_price__gte=value)
 
     def filter_max_delivery_time(self, queryset, name, value):
-        """Filter offers by maximum delivery time in days."""
-        return queryset.filter(details__delivery_time_in_days__lte=value).distinct()
+        """Filter offers having at least one detail deliverable within the given days."""
+        return queryset.filter(min_delivery_time__lte=value)
 
     def filter_creator_id(self, queryset, name, value):
         """Filter offers by the creator's user ID."""
-        return queryset.filter(user__id=value)
\ No newline at end of file
+        return queryset.filter(user_id=value)
+
+
+class StableOrderingFilter(filters.OrderingFilter):
+    """Ordering filter appending the primary key so pages stay stable and match the composite indexes."""
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if ordering and not any(field.lstrip('-') in ('id', 'pk') for field in ordering):
+            ordering = [*ordering, 'id']
+        return ordering
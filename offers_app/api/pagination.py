@@ -5,12 +5,30 @@ This module provides custom pagination classes for controlling
 the number of results returned in offer list views.
 """
 
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
 from rest_framework.pagination import PageNumberPagination
 
+from ..models import OFFER_COUNT_CACHE_KEY
+
+OFFER_COUNT_CACHE_TIMEOUT = 60
+
+
+class OfferPaginator(Paginator):
+    """Paginator serving the unfiltered offer count from the cache."""
+
+    @cached_property
+    def count(self):
+        if self.object_list.query.where:
+            return super().count
+        return cache.get_or_set(OFFER_COUNT_CACHE_KEY, self.object_list.count, OFFER_COUNT_CACHE_TIMEOUT)
+
 
 class OfferPagination(PageNumberPagination):
     """Custom pagination class for offer list views."""
 
+    django_paginator_class = OfferPaginator
     page_size = 5
     page_size_query_param = 'page_size'
     max_page_size = 50
\ No newline at end of file
@@ -6,54 +6,70 @@ to/from JSON. It includes serializers for listing, creating, and updating offers
 their associated pricing details.
 """
 
-import os
+import copy
 
+from django.db import transaction
+from django.urls import reverse
 from rest_framework import serializers
 
 from offers_app.models import Offer, OfferDetails
-from user_auth_app.models import UserProfile
 
-class OfferDetailsHyperlinkedSerializer(serializers.HyperlinkedModelSerializer):
-    """Hyperlinked serializer for OfferDetails."""
-    url = serializers.HyperlinkedIdentityField(view_name='offerdetail-detail')
-
-    class Meta:
-        model = OfferDetails
-        fields = ('id', 'url') 
-
-class OfferDetailsSerializer(serializers.ModelSerializer):
+class CachedFieldsSerializerMixin:
+    """
+    Reuse the field definitions built by get_fields() across instances of a serializer class.
+
+    ModelSerializer introspects the model every time a serializer is instantiated. The
+    unbound field instances are cached per class and deep-copied for each new serializer,
+    so binding and request-specific state never leak between instances.
+    """
+
+    def get_fields(self):
+        cls = type(self)
+        cached_fields = cls.__dict__.get('_cached_fields')
+        if cached_fields is None:
+            cached_fields = super().get_fields()
+            cls._cached_fields = cached_fields
+        return copy.deepcopy(cached_fields)
+
+class OfferDetailLinksField(serializers.Field):
+    """
+    Read-only field rendering an offer's details as id/url pairs.
+
+    Reads the (usually prefetched) related rows directly instead of running a nested
+    serializer per detail, and resolves the URL prefix once per bound field.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def get_url_prefix(self):
+        if not hasattr(self, '_url_prefix'):
+            placeholder = reverse('offerdetail-detail', args=[0])
+            self._url_prefix = self.context['request'].build_absolute_uri(placeholder[:placeholder.rindex('0/')])
+        return self._url_prefix
+
+    def to_representation(self, details):
+        prefix = self.get_url_prefix()
+        return [{'id': detail.id, 'url': f'{prefix}{detail.id}/'} for detail in details.all()]
+
+class OfferDetailsSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """Serializer for OfferDetails model."""
 
     class Meta:
         model = OfferDetails
         fields = ('id','title','revisions','delivery_time_in_days','price','features','offer_type')
 
-class OfferSerializer(serializers.ModelSerializer):
+class OfferSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """Serializer for Offer model with computed fields."""
-    details = OfferDetailsHyperlinkedSerializer(many=True, read_only=True)
-    min_price = serializers.SerializerMethodField()
-    min_delivery_time = serializers.SerializerMethodField()
+    details = OfferDetailLinksField()
+    min_price = serializers.IntegerField(read_only=True)
+    min_delivery_time = serializers.IntegerField(read_only=True)
     user_details = serializers.SerializerMethodField()
 
-    def get_min_price(self, obj):
-        """Return the minimum price among all offer details."""
-        details = obj.details.all()
-        if details.exists():
-            return min(detail.price for detail in details)
-        return None
-    
-    def get_min_delivery_time(self, obj):
-        """Return the minimum delivery time in days among all offer details."""
-        details = obj.details.all()
-        if details.exists():
-            return min(detail.delivery_time_in_days for detail in details)
-        return None
-    
     def get_user_details(self, obj):
         """Return the user's first name, last name, and username."""
-        user = UserProfile.objects.filter(id=obj.user.id).first()
-        if not user:
-            return None
+        user = obj.user
         return {
             'first_name': user.first_name,
             'last_name': user.last_name,
@@ -80,28 +96,27 @@ class OfferCreateSerializer(serializers.ModelSerializer):
         model = Offer
         fields = ['id', 'title', 'image', 'description', 'details']
 
+    def validate_details(self, value):
+        """Validate that exactly three offer details with distinct offer types are provided."""
+        if len(value) != 3:
+            raise serializers.ValidationError("You must provide 3 OfferDetails.")
+        if len({detail['offer_type'] for detail in value}) != len(value):
+            raise serializers.ValidationError("Each OfferDetail must have a different offer_type.")
+        return value
+
+    @transaction.atomic
     def create(self, validated_data):
         """Create a new offer with associated details."""
-        details_data = validated_data.pop('details', None)
+        details_data = validated_data.pop('details')
+        validated_data['min_price'] = min((d['price'] for d in details_data if d.get('price') is not None), default=None)
+        validated_data['min_delivery_time'] = min(
+            (d['delivery_time_in_days'] for d in details_data if d.get('delivery_time_in_days') is not None), default=None
+        )
         offer = Offer.objects.create(**validated_data)
-
-        if details_data and len(details_data) != 3:
-            raise serializers.ValidationError({"details": "You must provide 3 OfferDetails."})
-        if details_data:
-            OfferDetails.objects.bulk_create([
-                OfferDetails(offer=offer, **detail) for detail in details_data
-            ])
+        OfferDetails.objects.bulk_create([
+            OfferDetails(offer=offer, **detail) for detail in details_data
+        ])
         return offer
-
-    def validate_image(self, value):
-        """Validate that the uploaded image has an allowed extension."""
-        if not value:
-            return value
-        valid_extensions = ['.jpg', '.jpeg', '.png']
-        extension = os.path.splitext(value.name)[1].lower()
-        if extension not in valid_extensions:
-            raise serializers.ValidationError(f"Invalid file. Allowed extensions are {', '.join(valid_extensions)}.")
-        return value
     
 class OfferUpdateSerializer(OfferSerializer):
     """Serializer for updating existing Offer instances."""
@@ -110,35 +125,24 @@ class OfferUpdateSerializer(OfferSerializer):
     def update(self, instance, validated_data):
         """Update an existing offer and its details."""
         details_data = validated_data.pop('details', None)
-        image = validated_data.pop('image', None)
         instance = super().update(instance, validated_data)
 
-        if image:
-            instance.image = image
-            instance.save()
-
         if details_data:
-            for detail_data in details_data:
-                detail_offer_type = detail_data.get('offer_type', None)
-                if detail_offer_type:
-                    try:
-                        detail_instance = OfferDetails.objects.get(offer=instance, offer_type=detail_offer_type)
-                        if detail_instance is not None:
-                            if detail_instance.title is not None:
-                                detail_instance.title = detail_data.get('title')
-                            if detail_instance.revisions is not None:
-                                detail_instance.revisions = detail_data.get('revisions')
-                            if detail_instance.delivery_time_in_days is not None:
-                                detail_instance.delivery_time_in_days = detail_data.get('delivery_time_in_days')
-                            if detail_instance.price is not None:
-                                detail_instance.price = detail_data.get('price')
-                            if detail_instance.features is not None:
-                                detail_instance.features = detail_data.get('features')
-                            detail_instance.save()
-                    except OfferDetails.DoesNotExist:
-                        raise serializers.ValidationError({"details": "OfferDetail does not exist."})
-                else:
-                    raise serializers.ValidationError({"details": "Offer_type for OfferDetail must be provided."})
+            if any(not detail_data.get('offer_type') for detail_data in details_data):
+                raise serializers.ValidationError({"details": "Offer_type for OfferDetail must be provided."})
+            by_type = {detail_data['offer_type']: detail_data for detail_data in details_data}
+            existing = list(OfferDetails.objects.filter(offer=instance, offer_type__in=by_type))
+            if len(existing) != len(by_type):
+                raise serializers.ValidationError({"details": "OfferDetail does not exist."})
+            updated_fields = set()
+            for detail_instance in existing:
+                for field, value in by_type[detail_instance.offer_type].items():
+                    setattr(detail_instance, field, value)
+                    updated_fields.add(field)
+            updated_fields.discard('offer_type')
+            if updated_fields:
+                OfferDetails.objects.bulk_update(existing, sorted(updated_fields))
+            instance.refresh_min_values()
         return instance
         
     class Meta:
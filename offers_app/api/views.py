@@ -5,16 +5,22 @@ This module provides API views for managing offers and offer details in the appl
 It includes endpoints for listing, creating, updating, and deleting offers and their associated details.
 """
 
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Prefetch
+from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import generics, status, viewsets, filters
-from rest_framework.permissions import AllowAny
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from offers_app.models import Offer, OfferDetails
-from django.db.models import Min
+from core.renderers import ORJSONRenderer
+from offers_app.models import OFFER_LIST_VERSION_KEY, Offer, OfferDetails
 
-from .filters import OfferFilter
-from django_filters.rest_framework import DjangoFilterBackend
+from .filters import OfferFilter, StableOrderingFilter
 from .pagination import OfferPagination
 from .permissions import IsBusinessUser, IsOwnerOrAdminOrReadOnly
 from .serializers import (
@@ -25,6 +31,17 @@ from .serializers import (
     OfferUpdateSerializer,
 )
 
+OFFER_LIST_CACHE_TIMEOUT = 60
+
+def get_offer_queryset():
+    """Return offers with their owner joined and detail ids prefetched, limited to the serialized columns."""
+    return Offer.objects.select_related('user').only(
+        'id', 'title', 'image', 'description', 'min_price', 'min_delivery_time', 'created_at', 'updated_at',
+        'user__first_name', 'user__last_name', 'user__username',
+    ).prefetch_related(
+        Prefetch('details', queryset=OfferDetails.objects.only('id', 'offer_id'))
+    )
+
 class OffersView(generics.ListCreateAPIView):
     """
     API view for listing and creating offers.
@@ -32,15 +49,35 @@ class OffersView(generics.ListCreateAPIView):
     Supports filtering, pagination, searching, and ordering of offers.
     Only business users can create offers.
     """
-    queryset = Offer.objects.all().annotate(min_price=Min('details__price'))
     serializer_class = OfferSerializer
     permission_classes = [IsBusinessUser]
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
     pagination_class = OfferPagination
     filterset_class = OfferFilter
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.SearchFilter, StableOrderingFilter]
     search_fields = ['title', 'description']
     ordering_fields = ['updated_at', 'min_price']
-    ordering = ['updated_at']
+    ordering = ['updated_at', 'id']
+
+    def get_queryset(self):
+        """Return the offer list queryset with related rows loaded up front."""
+        return get_offer_queryset()
+
+    def list(self, request, *args, **kwargs):
+        """
+        Serve the offer list from the cache when nothing changed since it was built.
+
+        Responses are keyed on the full request URL and a list version that the offer
+        signals reset whenever an offer, its details or its owner change.
+        """
+        version = cache.get_or_set(OFFER_LIST_VERSION_KEY, time.time_ns, None)
+        url_hash = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+        cache_key = f'offers:list:{version}:{url_hash}'
+        data = cache.get(cache_key)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(cache_key, data, OFFER_LIST_CACHE_TIMEOUT)
+        return Response(data)
     
     def post(self, request):
         """
@@ -53,11 +90,10 @@ class OffersView(generics.ListCreateAPIView):
             Response: Serialized offer object on success, errors on failure
         """
         self.serializer_class = OfferCreateSerializer
-        serializer = self.serializer_class(data=request.data)
+        serializer = self.serializer_class(data=request.data, context={"request": request})
         if serializer.is_valid():
-            offer = serializer.save(user_id=request.user.id)
-            response_serializer = OfferCreateSerializer(offer, context={"request": request})
-            return Response(response_serializer.data, status=status.HTTP_201_CREATED)
+            serializer.save(user=request.user)
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=400)
     
 class OfferDetailView(APIView):
@@ -68,6 +104,21 @@ class OfferDetailView(APIView):
     Only the offer owner or admin can update or delete an offer.
     """
     permission_classes = [IsOwnerOrAdminOrReadOnly]
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
+
+    def get_owned_offer(self, request, pk, queryset):
+        """
+        Fetch an offer together with its owner and run the object permission checks.
+
+        Returns None if the offer does not exist; raises PermissionDenied if the
+        requesting user may not modify it.
+        """
+        try:
+            offer = queryset.select_related('user').get(pk=pk)
+        except Offer.DoesNotExist:
+            return None
+        self.check_object_permissions(request, offer)
+        return offer
 
     def get(self, request, pk):
         """
@@ -82,7 +133,7 @@ class OfferDetailView(APIView):
         """
         self.serializer_class = OfferDetailSerializer
         try:
-            offer = Offer.objects.get(pk=pk)
+            offer = get_offer_queryset().get(pk=pk)
         except Offer.DoesNotExist:
             return Response({'error': 'Offer not found'}, status=status.HTTP_404_NOT_FOUND)
         
@@ -101,16 +152,14 @@ class OfferDetailView(APIView):
             Response: Updated offer object or error message
         """
         self.serializer_class = OfferUpdateSerializer
-        try:
-            offer = Offer.objects.get(pk=pk)
-        except Offer.DoesNotExist:
-            return Response({'error': 'Offer not found'}, status=status.HTTP_404_NOT_FOUND)
-        if self.check_object_permissions(request, offer) is not None:
-            return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
-        serializer = self.serializer_class(offer, data=request.data, context={'request': request})
-        if serializer.is_valid():
-            serializer.save()
-            return Response(serializer.data, status=status.HTTP_200_OK)
+        with transaction.atomic():
+            offer = self.get_owned_offer(request, pk, Offer.objects.select_for_update(of=('self',)))
+            if offer is None:
+                return Response({'error': 'Offer not found'}, status=status.HTTP_404_NOT_FOUND)
+            serializer = self.serializer_class(offer, data=request.data, context={'request': request})
+            if serializer.is_valid():
+                serializer.save()
+                return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=400)
     
     def delete(self, request, pk):
@@ -126,16 +175,14 @@ class OfferDetailView(APIView):
         Returns:
             Response: 204 No Content on success, error message on failure
         """
-        try:
-            offer = Offer.objects.get(pk=pk)
-        except Offer.DoesNotExist:
+        offer = self.get_owned_offer(request, pk, Offer.objects.all())
+        if offer is None:
             return Response({'error': 'Offer not found'}, status=status.HTTP_404_NOT_FOUND)
-        if self.check_object_permissions(request, offer) is not None:
-            return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         offer.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 class OfferDetailsView(viewsets.ReadOnlyModelViewSet):
     """Read-only API viewset for offer details."""
     queryset = OfferDetails.objects.all()
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
     serializer_class = OfferDetailsSerializer
\ No newline at end of file
@@ -0,0 +1,40 @@
+# Generated by Django 6.0 on 2026-10-15 22:04
+
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def populate_min_values(apps, schema_editor):
+    Offer = apps.get_model('offers_app', 'Offer')
+    for offer in Offer.objects.annotate(
+        details_min_price=Min('details__price'),
+        details_min_delivery_time=Min('details__delivery_time_in_days'),
+    ):
+        offer.min_price = offer.details_min_price
+        offer.min_delivery_time = offer.details_min_delivery_time
+        offer.save(update_fields=['min_price', 'min_delivery_time'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offer',
+            name='min_delivery_time',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='offer',
+            name='min_price',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(fields=['min_price'], name='offer_min_price_idx'),
+        ),
+        migrations.RunPython(populate_min_values, migrations.RunPython.noop),
+    ]
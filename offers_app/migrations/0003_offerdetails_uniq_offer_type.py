@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-15 22:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0002_offer_min_values'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='offerdetails',
+            constraint=models.UniqueConstraint(fields=('offer', 'offer_type'), name='uniq_offer_type'),
+        ),
+    ]
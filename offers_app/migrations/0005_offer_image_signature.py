@@ -0,0 +1,20 @@
+# Generated by Django 6.0 on 2026-10-15 23:16
+
+import django.core.validators
+import offers_app.utils.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0004_offer_updated_at_id_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='offer',
+            name='image',
+            field=models.FileField(blank=True, null=True, upload_to='offer_images/', validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['jpg', 'jpeg', 'png']), offers_app.utils.validators.validate_image_signature]),
+        ),
+    ]
@@ -1,43 +1,85 @@
-import os
+from functools import partial
+
 from django.core.validators import FileExtensionValidator
+from django.core.cache import cache
 from django.core.files.storage import default_storage
-from django.db.models.signals import post_delete
-from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.db import models, transaction
+from django.db.models import Min
 from django.dispatch import receiver
 from user_auth_app.models import UserProfile
 
+from .utils.validators import validate_image_signature
+
+OFFER_COUNT_CACHE_KEY = 'offers:count:v1'
+OFFER_LIST_VERSION_KEY = 'offers:list:version'
+OFFER_IMAGE_NAME_TEMPLATE = 'user_{user_id}_{username}_offer_{offer_id}.{ext}'
+
+
+def delete_file_on_commit(name):
+    """Delete a stored file once the surrounding transaction commits."""
+    transaction.on_commit(partial(default_storage.delete, name))
+
+
+def delete_cache_on_commit(*keys):
+    """Drop cache keys once the surrounding transaction commits, so no reader re-caches uncommitted rows."""
+    transaction.on_commit(partial(cache.delete_many, list(keys)))
+
+
 class Offer(models.Model):
     title = models.CharField(max_length=200)
-    image = models.FileField(upload_to='offer_images/', blank=True, null=True, validators=[FileExtensionValidator(allowed_extensions=['jpg', 'jpeg', 'png'])])
+    image = models.FileField(upload_to='offer_images/', blank=True, null=True, validators=[FileExtensionValidator(allowed_extensions=['jpg', 'jpeg', 'png']), validate_image_signature])
     description = models.TextField(blank=True)
     user = models.ForeignKey(UserProfile, related_name='offers', on_delete=models.CASCADE)
+    min_price = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    min_delivery_time = models.PositiveSmallIntegerField(blank=True, null=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['min_price', 'id'], name='offer_min_price_id_idx'),
+            models.Index(fields=['updated_at', 'id'], name='offer_updated_at_id_idx'),
+        ]
+
+    @classmethod
+    def update_min_values(cls, offer_id):
+        """Recompute and store the denormalized minimum price and delivery time of an offer."""
+        values = OfferDetails.objects.filter(offer_id=offer_id).aggregate(
+            min_price=Min('price'), min_delivery_time=Min('delivery_time_in_days')
+        )
+        cls.objects.filter(pk=offer_id).update(**values)
+        return values
+
+    def refresh_min_values(self):
+        """Recompute the denormalized minimum values and apply them to this instance."""
+        values = Offer.update_min_values(self.pk)
+        self.min_price = values['min_price']
+        self.min_delivery_time = values['min_delivery_time']
+
     def update_image(self):
         """Generate and set a standardized filename for the offer image."""
-        ext = self.image.name.split('.')[-1]
-        new_image_name = f"user_{self.user.id}_{self.user.username}_offer_{self.id}.{ext}"
-        self.image.name = new_image_name
+        ext = self.image.name.rpartition('.')[2].lower()
+        self.image.name = OFFER_IMAGE_NAME_TEMPLATE.format(
+            user_id=self.user.id, username=self.user.username, offer_id=self.id, ext=ext
+        )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'image' in field_names:
+            instance._loaded_image = values[field_names.index('image')] or None
+        return instance
 
     def save(self, *args, **kwargs):
-        if self.image:
+        """Rename newly uploaded images and remove the replaced file without re-reading the row."""
+        if self.image and not self.image._committed:
             self.update_image()
-        if self.id:
-            original = Offer.objects.get(pk=self.id)
-            if original.image:
-                old_image_path = original.image.path
-                if os.path.exists(old_image_path):
-                    default_storage.delete(old_image_path)
-                self.update_image()
+        loaded_image = getattr(self, '_loaded_image', None)
+        if loaded_image and loaded_image != (self.image.name if self.image else None):
+            delete_file_on_commit(loaded_image)
         super(Offer, self).save(*args, **kwargs)
-
-    def delete(self, *args, **kwargs):
-        if self.image:
-            image_path = self.image.path
-            if os.path.exists(image_path):
-                default_storage.delete(image_path)
-        super().delete(*args, **kwargs)
+        self._loaded_image = self.image.name if self.image else None
 
     def __str__(self):
         return f"Business User: {self.user.first_name} {self.user.last_name}, Offer: {self.id}"
@@ -47,9 +89,19 @@ class Offer(models.Model):
 def delete_offer_image(sender, instance, **kwargs):
     """Clean up offer image file from storage after the offer is deleted."""
     if instance.image:
-        image_path = instance.image.path
-        if os.path.exists(image_path):
-            default_storage.delete(image_path)
+        delete_file_on_commit(instance.image.name)
+
+@receiver(post_save, sender=Offer)
+@receiver(post_delete, sender=Offer)
+def invalidate_offer_count(sender, **kwargs):
+    """Drop the cached offer count and list responses after an offer changes."""
+    delete_cache_on_commit(OFFER_COUNT_CACHE_KEY, OFFER_LIST_VERSION_KEY)
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_offer_list_for_user(sender, **kwargs):
+    """Drop cached offer list responses, which embed the owner's names."""
+    delete_cache_on_commit(OFFER_LIST_VERSION_KEY)
 
 class OfferDetails(models.Model):
     offer = models.ForeignKey(Offer, related_name='details', on_delete=models.CASCADE)
@@ -61,4 +113,21 @@ class OfferDetails(models.Model):
     offer_type = models.CharField(max_length=20, choices=[('basic', 'Basic'), ('standard', 'Standard'), ('premium', 'Premium')])
 
     class Meta:
-        verbose_name = 'Offer Detail'
\ No newline at end of file
+        verbose_name = 'Offer Detail'
+        constraints = [models.UniqueConstraint(fields=['offer', 'offer_type'], name='uniq_offer_type')]
+
+
+@receiver(post_save, sender=OfferDetails)
+@receiver(post_delete, sender=OfferDetails)
+def sync_offer_min_values(sender, instance, **kwargs):
+    """
+    Keep the offer's minimum price and delivery time in sync when a detail changes.
+
+    Skipped when the delete cascades from an offer or its owner, since the offer row
+    is removed in the same cascade.
+    """
+    origin = kwargs.get('origin')
+    if isinstance(origin, (Offer, UserProfile)) or getattr(origin, 'model', None) in (Offer, UserProfile):
+        return
+    Offer.update_min_values(instance.offer_id)
+    delete_cache_on_commit(OFFER_LIST_VERSION_KEY)
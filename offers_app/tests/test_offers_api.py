@@ -4,16 +4,35 @@ from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 from django.contrib.auth import get_user_model
-from offers_app.models import Offer, OfferDetails
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from offers_app.models import OFFER_LIST_VERSION_KEY, Offer, OfferDetails
+from offers_app.api.serializers import OfferCreateSerializer
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework.exceptions import ValidationError
 
 User =  get_user_model()
 
+PNG_BYTES = b'\x89PNG\r\n\x1a\n' + b'image-bytes'
+JPEG_BYTES = b'\xff\xd8\xff' + b'image-bytes'
+
+OFFERS_LIST_URL = reverse('offers-list')
+
 pytestmark = pytest.mark.django_db
 
 @pytest.fixture
 def api_client():
     return APIClient()
 
+@pytest.fixture
+def auth_client(api_client):
+    """Return a factory authenticating the test's API client as the given user."""
+    def authenticate(user):
+        api_client.force_authenticate(user=user)
+        return api_client
+    return authenticate
+
 @pytest.fixture
 def business_user():
     return User.objects.create_user(
@@ -39,33 +58,36 @@ def offer(business_user):
         title="Test Offer",
         description="Test Description"
     )
-    OfferDetails.objects.create(
-        offer=offer,
-        title="Basic",
-        revisions=2,
-        delivery_time_in_days=5,
-        price=100,
-        features=["Feature 1"],
-        offer_type="basic"
-    )
-    OfferDetails.objects.create(
-        offer=offer,
-        title="Standard",
-        revisions=5,
-        delivery_time_in_days=7,
-        price=200,
-        features=["Feature 1", "Feature 2"],
-        offer_type="standard"
-    )
-    OfferDetails.objects.create(
-        offer=offer,
-        title="Premium",
-        revisions=10,
-        delivery_time_in_days=10,
-        price=500,
-        features=["Feature 1", "Feature 2", "Feature 3"],
-        offer_type="premium"
-    )
+    OfferDetails.objects.bulk_create([
+        OfferDetails(
+            offer=offer,
+            title="Basic",
+            revisions=2,
+            delivery_time_in_days=5,
+            price=100,
+            features=["Feature 1"],
+            offer_type="basic"
+        ),
+        OfferDetails(
+            offer=offer,
+            title="Standard",
+            revisions=5,
+            delivery_time_in_days=7,
+            price=200,
+            features=["Feature 1", "Feature 2"],
+            offer_type="standard"
+        ),
+        OfferDetails(
+            offer=offer,
+            title="Premium",
+            revisions=10,
+            delivery_time_in_days=10,
+            price=500,
+            features=["Feature 1", "Feature 2", "Feature 3"],
+            offer_type="premium"
+        ),
+    ])
+    offer.refresh_min_values()
     return offer
 
 @pytest.fixture
@@ -75,60 +97,117 @@ def offer_details(offer):
 # GET /api/offers/ Tests
 class TestOffersList:
     def test_list_offers_unauthenticated(self, api_client):
-        url = reverse('offers-list')
-        response = api_client.get(url)
+        response = api_client.get(OFFERS_LIST_URL)
         assert response.status_code == status.HTTP_200_OK
         assert 'results' in response.data
 
     def test_list_offers_with_creator_filter(self, api_client, business_user, offer):
-        url = reverse('offers-list')
-        response = api_client.get(url, {'creator_id': business_user.id})
+        response = api_client.get(OFFERS_LIST_URL, {'creator_id': business_user.id})
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data['results']) == 1
         assert response.data['results'][0]['user_details']['username'] == business_user.username
 
+    def test_offer_min_values_follow_detail_changes(self, offer):
+        offer.refresh_from_db()
+        assert offer.min_price == 100
+        assert offer.min_delivery_time == 5
+        basic = offer.details.get(offer_type='basic')
+        basic.price = 300
+        basic.save()
+        offer.refresh_from_db()
+        assert offer.min_price == 200
+        offer.details.get(offer_type='standard').delete()
+        offer.refresh_from_db()
+        assert offer.min_price == 300
+
+    def test_deleting_owner_skips_min_value_sync(self, business_user, offer):
+        with CaptureQueriesContext(connection) as ctx:
+            business_user.delete()
+        assert not Offer.objects.exists()
+        assert not any(q['sql'].startswith('UPDATE "offers_app_offer"') for q in ctx.captured_queries)
+
     def test_list_offers_with_min_price_filter(self, api_client, offer):
-        url = reverse('offers-list')
-        response = api_client.get(url, {'min_price': 200})
+        response = api_client.get(OFFERS_LIST_URL, {'min_price': 200})
         assert response.status_code == status.HTTP_200_OK
         assert all(offer['min_price'] >= 200 for offer in response.data['results'])
 
     def test_list_offers_with_max_delivery_time_filter(self, api_client, offer):
-        url = reverse('offers-list')
-        response = api_client.get(url, {'max_delivery_time': 7})
+        response = api_client.get(OFFERS_LIST_URL, {'max_delivery_time': 7})
         assert response.status_code == status.HTTP_200_OK
         assert all(offer['min_delivery_time'] <= 7 for offer in response.data['results'])
 
     def test_list_offers_with_ordering(self, api_client, offer):
-        url = reverse('offers-list')
-        response = api_client.get(url, {'ordering': 'min_price'})
+        response = api_client.get(OFFERS_LIST_URL, {'ordering': 'min_price'})
         assert response.status_code == status.HTTP_200_OK
         prices = [offer['min_price'] for offer in response.data['results']]
         assert prices == sorted(prices)
 
+    def test_list_offers_ordering_breaks_ties_by_id(self, api_client, business_user):
+        for index in range(3):
+            extra = Offer.objects.create(user=business_user, title=f"Offer {index}", description="Extra")
+            OfferDetails.objects.create(offer=extra, title="Basic", price=10, delivery_time_in_days=1, offer_type="basic")
+        response = api_client.get(OFFERS_LIST_URL, {'ordering': '-min_price'})
+        ids = [offer['id'] for offer in response.data['results']]
+        assert ids == sorted(ids)
+
+    def test_list_offers_detail_urls(self, api_client, offer):
+        response = api_client.get(OFFERS_LIST_URL)
+        assert response.status_code == status.HTTP_200_OK
+        details = response.data['results'][0]['details']
+        assert {detail['id'] for detail in details} == set(offer.details.values_list('id', flat=True))
+        for detail in details:
+            expected = 'http://testserver' + reverse('offerdetail-detail', args=[detail['id']])
+            assert detail['url'] == expected
+
+    def test_list_offers_query_count_independent_of_page_size(self, api_client, business_user, offer, django_assert_num_queries):
+        for index in range(3):
+            extra = Offer.objects.create(user=business_user, title=f"Offer {index}", description="Extra")
+            OfferDetails.objects.create(offer=extra, title="Basic", price=10, delivery_time_in_days=1, offer_type="basic")
+        with django_assert_num_queries(3):
+            response = api_client.get(OFFERS_LIST_URL)
+        assert len(response.data['results']) == 4
+
     def test_list_offers_with_search(self, api_client, offer):
-        url = reverse('offers-list')
-        response = api_client.get(url, {'search': 'Test'})
+        response = api_client.get(OFFERS_LIST_URL, {'search': 'Test'})
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data['results']) == 1
 
     def test_list_offers_with_pagination(self, api_client, offer):
-        url = reverse('offers-list')
-        response = api_client.get(url, {'page_size': 1})
+        response = api_client.get(OFFERS_LIST_URL, {'page_size': 1})
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data['results']) == 1
         assert response.data['count'] == 1
 
+    def test_list_offers_count_refreshes_after_create(self, api_client, business_user, offer, django_capture_on_commit_callbacks):
+        assert api_client.get(OFFERS_LIST_URL).data['count'] == 1
+        with django_capture_on_commit_callbacks(execute=True):
+            Offer.objects.create(user=business_user, title="Second Offer", description="Second Description")
+        assert api_client.get(OFFERS_LIST_URL).data['count'] == 2
+
+    def test_list_offers_served_from_cache_until_details_change(self, api_client, offer, django_assert_num_queries, django_capture_on_commit_callbacks):
+        assert api_client.get(OFFERS_LIST_URL).data['results'][0]['min_price'] == 100
+        with django_assert_num_queries(0):
+            api_client.get(OFFERS_LIST_URL)
+        with django_capture_on_commit_callbacks(execute=True):
+            offer.details.filter(offer_type='basic').get().delete()
+        assert api_client.get(OFFERS_LIST_URL).data['results'][0]['min_price'] == 200
+
+    def test_list_offers_cache_invalidated_only_on_commit(self, api_client, offer, django_capture_on_commit_callbacks):
+        api_client.get(OFFERS_LIST_URL)
+        with django_capture_on_commit_callbacks(execute=True):
+            offer.title = "Renamed"
+            offer.save()
+            assert cache.get(OFFER_LIST_VERSION_KEY) is not None
+        assert cache.get(OFFER_LIST_VERSION_KEY) is None
+
     def test_list_offers_invalid_params(self, api_client):
-        url = reverse('offers-list')
-        response = api_client.get(url, {'min_price': 'invalid'})
+        response = api_client.get(OFFERS_LIST_URL, {'min_price': 'invalid'})
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
 # POST /api/offers/ Tests
 class TestOfferCreate:
-    def test_create_offer_authenticated_business(self, api_client, business_user):
-        api_client.force_authenticate(user=business_user)
-        url = reverse('offers-list')
+    def test_create_offer_authenticated_business(self, auth_client, business_user):
+        client = auth_client(business_user)
         data = {
             "title": "New Offer",
             "description": "New Description",
@@ -159,14 +238,16 @@ class TestOfferCreate:
                 }
             ]
         }
-        response = api_client.post(url, data, format='json')
+        response = client.post(OFFERS_LIST_URL, data, format='json')
         assert response.status_code == status.HTTP_201_CREATED
         assert Offer.objects.count() == 1
         assert OfferDetails.objects.count() == 3
+        created = Offer.objects.get()
+        assert created.min_price == 100
+        assert created.min_delivery_time == 5
 
-    def test_create_offer_missing_details(self, api_client, business_user):
-        api_client.force_authenticate(user=business_user)
-        url = reverse('offers-list')
+    def test_create_offer_missing_details(self, auth_client, business_user):
+        client = auth_client(business_user)
         data = {
             "title": "Incomplete Offer",
             "description": "Missing details",
@@ -177,12 +258,11 @@ class TestOfferCreate:
                 }
             ]
         }
-        response = api_client.post(url, data, format='json')
+        response = client.post(OFFERS_LIST_URL, data, format='json')
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
-    def test_create_offer_not_enough_details(self, api_client, business_user):
-        api_client.force_authenticate(user=business_user)
-        url = reverse('offers-list')
+    def test_create_offer_not_enough_details(self, auth_client, business_user):
+        client = auth_client(business_user)
         data = {
             "title": "Incomplete Offer",
             "description": "Not enough details",
@@ -197,11 +277,26 @@ class TestOfferCreate:
                 }
             ]
         }
-        response = api_client.post(url, data, format='json')
+        response = client.post(OFFERS_LIST_URL, data, format='json')
         assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert Offer.objects.count() == 0
+
+    def test_create_offer_duplicate_offer_types(self, auth_client, business_user):
+        client = auth_client(business_user)
+        detail = {
+            "title": "Basic",
+            "revisions": 2,
+            "delivery_time_in_days": 5,
+            "price": 100,
+            "features": ["Feature 1"],
+            "offer_type": "basic"
+        }
+        data = {"title": "Duplicate Types", "description": "Same type three times", "details": [detail, detail, detail]}
+        response = client.post(OFFERS_LIST_URL, data, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert Offer.objects.count() == 0
 
     def test_create_offer_unauthenticated(self, api_client):
-        url = reverse('offers-list')
         data = {
             "title": "Unauthenticated Offer",
             "description": "Should fail",
@@ -216,12 +311,11 @@ class TestOfferCreate:
                 }
             ]
         }
-        response = api_client.post(url, data, format='json')
+        response = api_client.post(OFFERS_LIST_URL, data, format='json')
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
-    def test_create_offer_customer_user(self, api_client, customer_user):
-        api_client.force_authenticate(user=customer_user)
-        url = reverse('offers-list')
+    def test_create_offer_customer_user(self, auth_client, customer_user):
+        client = auth_client(customer_user)
         data = {
             "title": "customer User Offer",
             "description": "Should fail",
@@ -236,34 +330,45 @@ class TestOfferCreate:
                 }
             ]
         }
-        response = api_client.post(url, data, format='json')
+        response = client.post(OFFERS_LIST_URL, data, format='json')
         assert response.status_code == status.HTTP_403_FORBIDDEN
 
+    def test_validate_image_extension_and_signature(self):
+        image_field = OfferCreateSerializer().fields['image']
+        image = SimpleUploadedFile('offer.PNG', PNG_BYTES)
+        assert image_field.run_validation(image) is image
+        with pytest.raises(ValidationError):
+            image_field.run_validation(SimpleUploadedFile('offer.gif', PNG_BYTES))
+        with pytest.raises(ValidationError):
+            image_field.run_validation(SimpleUploadedFile('offer', PNG_BYTES))
+        with pytest.raises(ValidationError):
+            image_field.run_validation(SimpleUploadedFile('offer.jpg', b'GIF89a-not-a-jpeg'))
+
 # GET /api/offers/{id}/ Tests
 class TestOfferRetrieve:
-    def test_retrieve_offer_authenticated(self, api_client, customer_user, offer):
-        api_client.force_authenticate(user=customer_user)
-        url = reverse('offers-detail', kwargs={'pk': offer.id})
-        response = api_client.get(url)
+    def test_retrieve_offer_authenticated(self, auth_client, customer_user, offer):
+        client = auth_client(customer_user)
+        url = reverse('offers-detail', args=[offer.id])
+        response = client.get(url)
         assert response.status_code == status.HTTP_200_OK
         assert response.data['id'] == offer.id
 
     def test_retrieve_offer_unauthenticated(self, api_client, offer):
-        url = reverse('offers-detail', kwargs={'pk': offer.id})
+        url = reverse('offers-detail', args=[offer.id])
         response = api_client.get(url)
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
-    def test_retrieve_nonexistent_offer(self, api_client, customer_user):
-        api_client.force_authenticate(user=customer_user)
-        url = reverse('offers-detail', kwargs={'pk': 999})
-        response = api_client.get(url)
+    def test_retrieve_nonexistent_offer(self, auth_client, customer_user):
+        client = auth_client(customer_user)
+        url = reverse('offers-detail', args=[999])
+        response = client.get(url)
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
 # PATCH /api/offers/{id}/ Tests
 class TestOfferUpdate:
-    def test_update_offer_owner(self, api_client, business_user, offer):
-        api_client.force_authenticate(user=business_user)
-        url = reverse('offers-detail', kwargs={'pk': offer.id})
+    def test_update_offer_owner(self, auth_client, business_user, offer):
+        client = auth_client(business_user)
+        url = reverse('offers-detail', args=[offer.id])
         data = {
             "title": "Updated Title",
             "details": [
@@ -275,82 +380,146 @@ class TestOfferUpdate:
                 }
             ]
         }
-        response = api_client.patch(url, data, format='json')
+        response = client.patch(url, data, format='json')
         assert response.status_code == status.HTTP_200_OK
         assert response.data['title'] == "Updated Title"
         assert response.data['details'][0]['title'] == "Updated Basic"
 
-    def test_update_offer_non_owner(self, api_client, customer_user, offer):
-        api_client.force_authenticate(user=customer_user)
-        url = reverse('offers-detail', kwargs={'pk': offer.id})
+    def test_update_offer_details_keeps_omitted_fields(self, auth_client, business_user, offer):
+        client = auth_client(business_user)
+        url = reverse('offers-detail', args=[offer.id])
+        data = {
+            "title": "Test Offer",
+            "details": [
+                {"title": "Basic", "price": 150, "offer_type": "basic"},
+                {"title": "Premium", "delivery_time_in_days": 8, "offer_type": "premium"}
+            ]
+        }
+        response = client.patch(url, data, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        basic = offer.details.get(offer_type='basic')
+        premium = offer.details.get(offer_type='premium')
+        assert basic.price == 150
+        assert basic.delivery_time_in_days == 5
+        assert basic.features == ["Feature 1"]
+        assert premium.delivery_time_in_days == 8
+        assert premium.price == 500
+        offer.refresh_from_db()
+        assert offer.min_price == 150
+
+    def test_update_offer_unknown_detail_type(self, auth_client, business_user, offer):
+        client = auth_client(business_user)
+        url = reverse('offers-detail', args=[offer.id])
+        data = {"title": "Test Offer", "details": [{"title": "Gold", "offer_type": "gold"}]}
+        response = client.patch(url, data, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_update_offer_non_owner(self, auth_client, customer_user, offer):
+        client = auth_client(customer_user)
+        url = reverse('offers-detail', args=[offer.id])
         data = {"title": "Should Fail"}
-        response = api_client.patch(url, data, format='json')
+        response = client.patch(url, data, format='json')
         assert response.status_code == status.HTTP_403_FORBIDDEN
 
     def test_update_offer_unauthenticated(self, api_client, offer):
-        url = reverse('offers-detail', kwargs={'pk': offer.id})
+        url = reverse('offers-detail', args=[offer.id])
         data = {"title": "Should Fail"}
         response = api_client.patch(url, data, format='json')
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
-    def test_update_nonexistent_offer(self, api_client, business_user):
-        api_client.force_authenticate(user=business_user)
-        url = reverse('offers-detail', kwargs={'pk': 999})
+    def test_update_nonexistent_offer(self, auth_client, business_user):
+        client = auth_client(business_user)
+        url = reverse('offers-detail', args=[999])
         data = {"title": "Should Fail"}
-        response = api_client.patch(url, data, format='json')
+        response = client.patch(url, data, format='json')
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
-    def test_update_offer_invalid_data(self, api_client, business_user, offer):
-        api_client.force_authenticate(user=business_user)
-        url = reverse('offers-detail', kwargs={'pk': offer.id})
+    def test_update_offer_invalid_data(self, auth_client, business_user, offer):
+        client = auth_client(business_user)
+        url = reverse('offers-detail', args=[offer.id])
         data = {"title": ""}  # Empty title should fail
-        response = api_client.patch(url, data, format='json')
+        response = client.patch(url, data, format='json')
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
 # DELETE /api/offers/{id}/ Tests
 class TestOfferDelete:
-    def test_delete_offer_owner(self, api_client, business_user, offer):
-        api_client.force_authenticate(user=business_user)
-        url = reverse('offers-detail', kwargs={'pk': offer.id})
-        response = api_client.delete(url)
+    def test_delete_offer_owner(self, auth_client, business_user, offer):
+        client = auth_client(business_user)
+        url = reverse('offers-detail', args=[offer.id])
+        response = client.delete(url)
         assert response.status_code == status.HTTP_204_NO_CONTENT
         assert Offer.objects.count() == 0
 
-    def test_delete_offer_non_owner(self, api_client, customer_user, offer):
-        api_client.force_authenticate(user=customer_user)
-        url = reverse('offers-detail', kwargs={'pk': offer.id})
-        response = api_client.delete(url)
+    def test_delete_offer_non_owner(self, auth_client, customer_user, offer):
+        client = auth_client(customer_user)
+        url = reverse('offers-detail', args=[offer.id])
+        response = client.delete(url)
         assert response.status_code == status.HTTP_403_FORBIDDEN
 
     def test_delete_offer_unauthenticated(self, api_client, offer):
-        url = reverse('offers-detail', kwargs={'pk': offer.id})
+        url = reverse('offers-detail', args=[offer.id])
         response = api_client.delete(url)
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
-    def test_delete_nonexistent_offer(self, api_client, business_user):
-        api_client.force_authenticate(user=business_user)
-        url = reverse('offers-detail', kwargs={'pk': 999})
-        response = api_client.delete(url)
+    def test_delete_nonexistent_offer(self, auth_client, business_user):
+        client = auth_client(business_user)
+        url = reverse('offers-detail', args=[999])
+        response = client.delete(url)
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
+# Offer image handling Tests
+class TestOfferImage:
+    @pytest.fixture(autouse=True)
+    def media_root(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+        return tmp_path
+
+    def test_save_without_image_change_keeps_file(self, business_user, django_assert_num_queries):
+        offer = Offer.objects.create(user=business_user, title="Image Offer", image=SimpleUploadedFile('photo.png', PNG_BYTES))
+        offer = Offer.objects.get(pk=offer.pk)
+        image_name = offer.image.name
+        offer.title = "Renamed"
+        with django_assert_num_queries(1):
+            offer.save()
+        assert offer.image.name == image_name
+        assert offer.image.storage.exists(image_name)
+
+    def test_replacing_image_deletes_previous_file(self, business_user, django_capture_on_commit_callbacks):
+        offer = Offer.objects.create(user=business_user, title="Image Offer", image=SimpleUploadedFile('photo.png', PNG_BYTES))
+        offer = Offer.objects.get(pk=offer.pk)
+        old_name = offer.image.name
+        offer.image = SimpleUploadedFile('other.jpg', JPEG_BYTES)
+        with django_capture_on_commit_callbacks(execute=True):
+            offer.save()
+        assert not offer.image.storage.exists(old_name)
+        assert offer.image.storage.exists(offer.image.name)
+        assert offer.image.name.endswith(f"_offer_{offer.id}.jpg")
+
+    def test_deleting_offer_deletes_image(self, business_user, django_capture_on_commit_callbacks):
+        offer = Offer.objects.create(user=business_user, title="Image Offer", image=SimpleUploadedFile('photo.png', PNG_BYTES))
+        image_name = offer.image.name
+        with django_capture_on_commit_callbacks(execute=True):
+            offer.delete()
+        assert not offer.image.storage.exists(image_name)
+
 # GET /api/offerdetails/{id}/ Tests
 class TestOfferDetailRetrieve:
-    def test_retrieve_offer_detail_authenticated(self, api_client, customer_user, offer_details):
-        api_client.force_authenticate(user=customer_user)
+    def test_retrieve_offer_detail_authenticated(self, auth_client, customer_user, offer_details):
+        client = auth_client(customer_user)
         detail = offer_details.first()
-        url = reverse('offerdetail-detail', kwargs={'pk': detail.id})
-        response = api_client.get(url)
+        url = reverse('offerdetail-detail', args=[detail.id])
+        response = client.get(url)
         assert response.status_code == status.HTTP_200_OK
         assert response.data['id'] == detail.id
 
     def test_retrieve_offer_detail_unauthenticated(self, api_client, offer_details):
         detail = offer_details.first()
-        url = reverse('offerdetail-detail', kwargs={'pk': detail.id})
+        url = reverse('offerdetail-detail', args=[detail.id])
         response = api_client.get(url)
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
-    def test_retrieve_nonexistent_offer_detail(self, api_client, customer_user):
-        api_client.force_authenticate(user=customer_user)
-        url = reverse('offerdetail-detail', kwargs={'pk': 999})
-        response = api_client.get(url)
+    def test_retrieve_nonexistent_offer_detail(self, auth_client, customer_user):
+        client = auth_client(customer_user)
+        url = reverse('offerdetail-detail', args=[999])
+        response = client.get(url)
         assert response.status_code == status.HTTP_404_NOT_FOUND
\ No newline at end of file
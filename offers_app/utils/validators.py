@@ -0,0 +1,16 @@
+from django.core.exceptions import ValidationError
+
+IMAGE_SIGNATURES = (
+    b'\xff\xd8\xff',  # JPEG
+    b'\x89PNG\r\n\x1a\n',  # PNG
+)
+
+def validate_image_signature(value):
+    """Validate that a newly uploaded file starts with a JPEG or PNG signature."""
+    if getattr(value, '_committed', False):
+        return
+    value.seek(0)
+    header = value.read(8)
+    value.seek(0)
+    if not header.startswith(IMAGE_SIGNATURES):
+        raise ValidationError("Invalid file. Only JPEG and PNG images are allowed.")
@@ -6,23 +6,89 @@ Orders are created based on OfferDetails and track the transaction between
 customers and business users.
 """
 
-from django.shortcuts import get_object_or_404
 from rest_framework import serializers
 
+from core.serializers import rows_to_dicts
 from offers_app.models import OfferDetails
-from user_auth_app.models import UserProfile
 
-from ..models import Order
+from ..models import Order, delete_order_counts
+
+ORDER_BULK_CREATE_BATCH_SIZE = 500
+ORDER_LIST_KEYS = (
+    'id', 'customer_user', 'business_user', 'title', 'revisions', 'delivery_time_in_days',
+    'price', 'features', 'offer_type', 'status', 'created_at', 'updated_at',
+)
+ORDER_LIST_COLUMNS = tuple(f'{key}_id' if key in ('customer_user', 'business_user') else key for key in ORDER_LIST_KEYS)
+
+def serialize_order_list(orders):
+    """Render an order queryset like OrderSerializer(many=True) from plain column tuples."""
+    return rows_to_dicts(orders, ORDER_LIST_KEYS, ORDER_LIST_COLUMNS, datetime_keys=('created_at', 'updated_at'))
+
+def build_order(offer_detail, customer_user):
+    """Return an unsaved in-progress order snapshotting the given offer detail."""
+    return Order(
+        customer_user=customer_user,
+        business_user_id=offer_detail.offer.user_id,
+        title=offer_detail.title,
+        revisions=offer_detail.revisions,
+        delivery_time_in_days=offer_detail.delivery_time_in_days,
+        price=offer_detail.price,
+        features=offer_detail.features,
+        offer_type=offer_detail.offer_type,
+        status="in_progress"
+    )
+
+class OfferDetailIdField(serializers.PrimaryKeyRelatedField):
+    """Offer detail primary key field that reads from the details prefetched by OrderListSerializer."""
+
+    def to_internal_value(self, data):
+        offer_details = getattr(self.parent.parent, 'offer_details', None)
+        if offer_details is None or isinstance(data, bool):
+            return super().to_internal_value(data)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            return super().to_internal_value(data)
+        if pk not in offer_details:
+            self.fail('does_not_exist', pk_value=data)
+        return offer_details[pk]
+
+class OrderListSerializer(serializers.ListSerializer):
+    """List serializer validating all offer details with one query and creating the orders with a single bulk INSERT."""
+
+    def to_internal_value(self, data):
+        """Resolve every requested offer detail with one in_bulk() lookup before validating the items."""
+        if isinstance(data, list):
+            ids = set()
+            for item in data:
+                try:
+                    ids.add(int(item['offer_detail_id']))
+                except (KeyError, TypeError, ValueError):
+                    continue
+            self.offer_details = OfferDetails.objects.select_related('offer').in_bulk(ids)
+        return super().to_internal_value(data)
+
+    def create(self, validated_data):
+        """Create one order per offer detail and refresh the affected business users' counts."""
+        request_user = self.context['request'].user
+        orders = Order.objects.bulk_create(
+            [build_order(attrs['offer_detail_id'], request_user) for attrs in validated_data],
+            batch_size=ORDER_BULK_CREATE_BATCH_SIZE,
+        )
+        for business_user_id in {order.business_user_id for order in orders}:
+            delete_order_counts(business_user_id)
+        return orders
 
 class OrderSerializer(serializers.ModelSerializer):
     """Serializer for Order model."""
 
-    offer_detail_id = serializers.PrimaryKeyRelatedField(queryset=OfferDetails.objects.all(), write_only=True)
+    offer_detail_id = OfferDetailIdField(queryset=OfferDetails.objects.select_related('offer'), write_only=True)
 
     class Meta:
         model = Order
         fields = ['id', 'customer_user', 'business_user', 'title', 'revisions', 'delivery_time_in_days', 'price', 'features', 'offer_type', 'status', 'created_at', 'updated_at', 'offer_detail_id']
         read_only_fields = ['id', 'customer_user', 'business_user', 'title', 'revisions', 'delivery_time_in_days', 'price', 'features', 'offer_type', 'created_at', 'updated_at']
+        list_serializer_class = OrderListSerializer
 
     def create(self, validated_data):
         """Create a new order from an offer detail."""
@@ -30,29 +96,15 @@ class OrderSerializer(serializers.ModelSerializer):
         if not request_user.is_authenticated:
             raise serializers.ValidationError({"user": "Authentication is required."})
 
-        customer_user = get_object_or_404(UserProfile, id=request_user.id)
-        offer_detail_id = validated_data.pop('offer_detail_id')
-        business_user = get_object_or_404(UserProfile, id=offer_detail_id.offer.user.id)
-
-        order = Order.objects.create(
-            customer_user=customer_user,
-            business_user=business_user,
-            title=offer_detail_id.title,
-            revisions=offer_detail_id.revisions,
-            delivery_time_in_days=offer_detail_id.delivery_time_in_days,
-            price=offer_detail_id.price,
-            features=offer_detail_id.features,
-            offer_type=offer_detail_id.offer_type,
-            status="in_progress"
-        )
+        order = build_order(validated_data.pop('offer_detail_id'), request_user)
+        order.save()
         return order
     
-    def validate(self, attrs):
-        """Ensure only 'offer_detail_id' is provided when creating an order via POST."""
-        request = self.context['request']
-        if request and request.method == 'POST':
-            allowed_fields = {'offer_detail_id'}
-            unexpected_fields = set(self.initial_data.keys()) - allowed_fields
+    def to_internal_value(self, data):
+        """Ensure only 'offer_detail_id' is provided when creating an order."""
+        attrs = super().to_internal_value(data)
+        if not self.partial:
+            unexpected_fields = [key for key in data if key != 'offer_detail_id']
             if unexpected_fields:
                 raise serializers.ValidationError({
                     "non_field_errors": [f"Only 'offer_detail_id' is needed. But got: {', '.join(unexpected_fields)}."]
@@ -63,9 +115,6 @@ class OrderSerializer(serializers.ModelSerializer):
         """Update an existing order. Only the status field can be updated."""
         if set(validated_data.keys()) != {"status"}:
             raise serializers.ValidationError("Only the 'status' field can be updated. Valid values are: 'in_progress', 'completed', 'cancelled'.")
-        status = validated_data.pop('status', None)
-        instance = super().update(instance, validated_data)
-        if status:
-            instance.status = status
-            instance.save()
-        return instance
\ No newline at end of file
+        instance.status = validated_data['status']
+        instance.save(update_fields=['status', 'updated_at'])
+        return instance
@@ -6,15 +6,39 @@ It includes endpoints for listing, creating, updating, and deleting orders,
 as well as retrieving order statistics.
 """
 
+from django.core.cache import cache
+from django.db.models import Count, Q
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from offers_app.models import Offer, OfferDetails
 from user_auth_app.models import UserProfile
 
-from ..models import Order
-from .serializers import OrderSerializer
+from ..models import ORDER_COUNTS_CACHE_KEY, Order
+from .serializers import OrderSerializer, serialize_order_list
+
+ORDER_USER_FIELDS = {'customer': 'customer_user_id', 'business': 'business_user_id'}
+
+ORDER_COUNTS_CACHE_TIMEOUT = 30
+
+def get_order_counts(business_user_id):
+    """
+    Return the open and completed order counts of a business user, or None if the user does not exist.
+
+    Counts are computed in a single aggregate and cached per user; the Order signals drop
+    the entry whenever one of the user's orders changes.
+    """
+    cache_key = ORDER_COUNTS_CACHE_KEY.format(business_user_id=business_user_id)
+    counts = cache.get(cache_key)
+    if counts is None:
+        if not UserProfile.objects.filter(pk=business_user_id).exists():
+            return None
+        counts = Order.objects.filter(business_user_id=business_user_id).aggregate(
+            order_count=Count('id', filter=Q(status='in_progress')),
+            completed_order_count=Count('id', filter=Q(status='completed')),
+        )
+        cache.set(cache_key, counts, ORDER_COUNTS_CACHE_TIMEOUT)
+    return counts
 
 class OrdersView(APIView):
     """
@@ -38,20 +62,19 @@ class OrdersView(APIView):
         Returns:
             Response: List of serialized order objects
         """
-        if request.user.type == 'customer':
-            orders = Order.objects.filter(customer_user__id=request.user.id)
-        elif request.user.type == 'business':
-            orders = Order.objects.filter(business_user__id=request.user.id)
-        else:
+        user_field = ORDER_USER_FIELDS.get(request.user.type)
+        if user_field is None:
             orders = Order.objects.none()
-        serializer = OrderSerializer(orders, many=True)
-        return Response(serializer.data)
+        else:
+            orders = Order.objects.filter(**{user_field: request.user.pk})
+        return Response(serialize_order_list(orders))
 
     def post(self, request):
         """
         Create a new order from an offer detail.
 
-        Only customer users can create orders. Requires an offer_detail_id.
+        Only customer users can create orders. Requires an offer_detail_id. A list of
+        such objects creates one order per entry with a single bulk INSERT.
 
         Args:
             request: HTTP request containing order data
@@ -59,22 +82,18 @@ class OrdersView(APIView):
         Returns:
             Response: Serialized order object on success, errors on failure
         """
-        offer_details_id = request.data.get('offer_detail_id')
-        if offer_details_id is None:
-            return Response({"error": "offer_detail_id is required."}, status=status.HTTP_400_BAD_REQUEST)
-        if isinstance(offer_details_id, str):
-            try:
-                offer_details_id = int(offer_details_id)
-            except ValueError:
-                return Response({"error": "offer_detail_id must be a number."}, status=status.HTTP_400_BAD_REQUEST)
-        if offer_details_id not in OfferDetails.objects.values_list('id', flat=True):
-            return Response({"error": "Given Offer Detail ID not found."}, status=status.HTTP_404_NOT_FOUND)
         if request.user.type == 'business':
             return Response({"detail": "Only customers can create orders."}, status=status.HTTP_403_FORBIDDEN)
-        serializer = OrderSerializer(data=request.data, context={'request': request})
+        if isinstance(request.data, list):
+            serializer = OrderSerializer(data=request.data, many=True, allow_empty=False, context={'request': request})
+        else:
+            serializer = OrderSerializer(data=request.data, context={'request': request})
         if serializer.is_valid():
             serializer.save()
             return Response(serializer.data, status=status.HTTP_201_CREATED)
+        item_errors = serializer.errors if isinstance(serializer.errors, list) else [serializer.errors]
+        if any(error.code == 'does_not_exist' for errors in item_errors for error in errors.get('offer_detail_id', [])):
+            return Response({"error": "Given Offer Detail ID not found."}, status=status.HTTP_404_NOT_FOUND)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
     def patch(self, request, pk):
@@ -95,7 +114,7 @@ class OrdersView(APIView):
         except Order.DoesNotExist:
             return Response({'error': 'Order not found'}, status=status.HTTP_404_NOT_FOUND)
         
-        if request.user.type != 'business' or order.business_user.id != request.user.id:
+        if request.user.type != 'business' or order.business_user_id != request.user.pk:
             return Response({'error': 'Permission denied, you need to be the creator of the related offer to change order Status!'}, status=status.HTTP_403_FORBIDDEN)
         
         serializer = OrderSerializer(order, data=request.data, partial=True, context={'request': request})
@@ -117,15 +136,12 @@ class OrdersView(APIView):
         Returns:
             Response: 204 No Content on success, error message on failure
         """
-        try:
-            order = Order.objects.get(pk=pk)
-        except Order.DoesNotExist:
-            return Response({'error': 'Order not found'}, status=status.HTTP_404_NOT_FOUND)
-        
         if not request.user.is_staff:
             return Response({'error': 'Permission denied, only staff can delete orders!'}, status=status.HTTP_403_FORBIDDEN)
         
-        order.delete()
+        deleted, _ = Order.objects.filter(pk=pk).delete()
+        if not deleted:
+            return Response({'error': 'Order not found'}, status=status.HTTP_404_NOT_FOUND)
         return Response(status=status.HTTP_204_NO_CONTENT)
     
 class OrderCountView(APIView):
@@ -133,10 +149,11 @@ class OrderCountView(APIView):
 
     def get(self, request, pk):
         """Get the total number of orders for a specific business user."""
-        if pk not in UserProfile.objects.values_list('id', flat=True):
+        counts = get_order_counts(pk)
+        if counts is None:
             return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
         if request.user.is_authenticated:
-            order_count = Order.objects.filter(business_user__id=pk).exclude(status='completed').exclude(status='cancelled').count()
+            order_count = counts['order_count']
             return Response({'order_count': order_count}, status=status.HTTP_200_OK)
         return Response({'error': 'Permission denied, log in to view order count'}, status=status.HTTP_403_FORBIDDEN)
     
@@ -145,9 +162,10 @@ class CompletedOrderCountView(APIView):
 
     def get(self, request, pk):
         """Get the number of completed orders for a specific business user."""
-        if pk not in UserProfile.objects.values_list('id', flat=True):
+        counts = get_order_counts(pk)
+        if counts is None:
             return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
         if request.user.is_authenticated:
-            completed_order_count = Order.objects.filter(business_user__id=pk, status='completed').count()
+            completed_order_count = counts['completed_order_count']
             return Response({'completed_order_count': completed_order_count}, status=status.HTTP_200_OK)
         return Response({'error': 'Permission denied, log in to view completed order count!'}, status=status.HTTP_403_FORBIDDEN)
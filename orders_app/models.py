@@ -1,7 +1,11 @@
 from django.db import models
-from offers_app.models import OfferDetails
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from offers_app.models import OfferDetails, delete_cache_on_commit
 from user_auth_app.models import UserProfile
 
+ORDER_COUNTS_CACHE_KEY = 'orders:counts:v1:{business_user_id}'
+
 class OrderStatus(models.TextChoices):
     IN_PROGRESS = 'in_progress', 'In Progress'
     COMPLETED = 'completed', 'Completed'
@@ -25,3 +29,25 @@ class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['business_user', 'status'], name='order_business_status_idx'),
+            models.Index(fields=['customer_user', 'status'], name='order_customer_status_idx'),
+        ]
+
+
+def delete_order_counts(business_user_id):
+    """Drop the cached order counts of a business user once the surrounding transaction commits."""
+    delete_cache_on_commit(ORDER_COUNTS_CACHE_KEY.format(business_user_id=business_user_id))
+
+
+@receiver(post_save, sender=Order)
+@receiver(post_delete, sender=Order)
+def invalidate_order_counts(sender, instance, **kwargs):
+    """Drop the cached order counts of the order's business user."""
+    delete_order_counts(instance.business_user_id)
+
+@receiver(post_delete, sender=UserProfile)
+def invalidate_deleted_user_order_counts(sender, instance, **kwargs):
+    """Drop cached order counts of a deleted user so the count endpoints answer 404 again."""
+    delete_order_counts(instance.pk)
@@ -60,7 +60,8 @@ import pytest
 from rest_framework.test import APIClient
 from django.db import IntegrityError
 from orders_app.models import Order
-from offers_app.models import Offer
+from orders_app.api.serializers import OrderSerializer
+from offers_app.models import Offer, OfferDetails
 
 
 @pytest.fixture
@@ -245,6 +246,47 @@ class TestOrdersListEndpoint:
         }
         assert expected_keys.issubset(set(found.keys()))
 
+    def test_list_uses_single_query(self, api_client, create_user, django_assert_num_queries):
+        customer = create_user("cust_queries", user_type="customer")
+        business = create_user("biz_queries", user_type="business")
+        for index in range(3):
+            safe_create_order(
+                customer_user=customer,
+                business_user=business,
+                title=f"Order {index}",
+                revisions=1,
+                delivery_time_in_days=2,
+                price=50,
+                features=[],
+                offer_type="basic",
+                status="in_progress",
+            )
+        api_client.force_authenticate(user=business)
+        with django_assert_num_queries(1):
+            resp = api_client.get(self.endpoint)
+        assert resp.status_code == 200
+        assert len(resp.json()) == 3
+        assert {item["customer_user"] for item in resp.json()} == {customer.pk}
+
+    def test_list_matches_order_serializer_output(self, api_client, create_user):
+        customer = create_user("cust_shape", user_type="customer")
+        business = create_user("biz_shape", user_type="business")
+        safe_create_order(
+            customer_user=customer,
+            business_user=business,
+            title="Shape",
+            revisions=2,
+            delivery_time_in_days=4,
+            price=75,
+            features=["A", "B"],
+            offer_type="standard",
+            status="completed",
+        )
+        api_client.force_authenticate(user=customer)
+        resp = api_client.get(self.endpoint)
+        expected = OrderSerializer(Order.objects.filter(customer_user=customer), many=True).data
+        assert resp.json() == [dict(item) for item in expected]
+
 
 @pytest.mark.django_db
 class TestOrdersCreateEndpoint:
@@ -271,8 +313,76 @@ class TestOrdersCreateEndpoint:
         customer = create_user("cust_create2", user_type="customer")
         api_client.force_authenticate(user=customer)
         resp = api_client.post(self.endpoint, {"offer_detail_id": 999999}, format="json")
-        assert resp.status_code == 404  
+        assert resp.status_code == 404
 
+    def test_non_numeric_offer_detail_id_returns_400(self, api_client, create_user):
+        customer = create_user("cust_create4", user_type="customer")
+        api_client.force_authenticate(user=customer)
+        resp = api_client.post(self.endpoint, {"offer_detail_id": "abc"}, format="json")
+        assert resp.status_code == 400
+
+    def test_extra_fields_return_400(self, api_client, create_user):
+        customer = create_user("cust_create5", user_type="customer")
+        business = create_user("biz_create5", user_type="business")
+        offer = safe_create_offerdetail(user=business, title="Logo", description="Logo design")
+        detail = OfferDetails.objects.create(
+            offer=offer, title="Basic", revisions=2, delivery_time_in_days=5,
+            price=100, features=["Logo"], offer_type="basic",
+        )
+        api_client.force_authenticate(user=customer)
+        resp = api_client.post(self.endpoint, {"offer_detail_id": detail.id, "price": 1}, format="json")
+        assert resp.status_code == 400
+        assert "price" in resp.json()["non_field_errors"][0]
+        assert not Order.objects.exists()
+
+    def test_customer_creates_order_from_offer_detail(self, api_client, create_user, django_assert_num_queries):
+        customer = create_user("cust_create3", user_type="customer")
+        business = create_user("biz_create3", user_type="business")
+        offer = safe_create_offerdetail(user=business, title="Logo", description="Logo design")
+        detail = OfferDetails.objects.create(
+            offer=offer, title="Basic", revisions=2, delivery_time_in_days=5,
+            price=100, features=["Logo"], offer_type="basic",
+        )
+        api_client.force_authenticate(user=customer)
+        with django_assert_num_queries(2):
+            resp = api_client.post(self.endpoint, {"offer_detail_id": detail.id}, format="json")
+        assert resp.status_code == 201
+        data = resp.json()
+        assert data["customer_user"] == customer.pk
+        assert data["business_user"] == business.pk
+        assert data["price"] == 100
+        assert data["status"] == "in_progress"
+
+
+    def test_customer_creates_orders_in_bulk(self, api_client, create_user, django_assert_num_queries):
+        customer = create_user("cust_bulk", user_type="customer")
+        business = create_user("biz_bulk", user_type="business")
+        offer = safe_create_offerdetail(user=business, title="Logo", description="Logo design")
+        details = [
+            OfferDetails.objects.create(
+                offer=offer, title=offer_type.title(), revisions=1, delivery_time_in_days=days,
+                price=price, features=[], offer_type=offer_type,
+            )
+            for offer_type, days, price in (("basic", 3, 50), ("standard", 5, 120), ("premium", 7, 300))
+        ]
+        api_client.force_authenticate(user=customer)
+        payload = [{"offer_detail_id": detail.id} for detail in details]
+        with django_assert_num_queries(2):
+            resp = api_client.post(self.endpoint, payload, format="json")
+        assert resp.status_code == 201
+        assert [item["price"] for item in resp.json()] == [50, 120, 300]
+        assert Order.objects.filter(customer_user=customer, business_user=business).count() == 3
+
+    def test_bulk_create_with_unknown_offer_detail_returns_404(self, api_client, create_user):
+        customer = create_user("cust_bulk2", user_type="customer")
+        api_client.force_authenticate(user=customer)
+        resp = api_client.post(self.endpoint, [{"offer_detail_id": 999999}], format="json")
+        assert resp.status_code == 404
+        resp = api_client.post(self.endpoint, [{"offer_detail_id": "999999"}, {"offer_detail_id": "abc"}], format="json")
+        assert resp.status_code == 404
+        resp2 = api_client.post(self.endpoint, [], format="json")
+        assert resp2.status_code == 400
+        assert not Order.objects.exists()
 
 @pytest.mark.django_db
 class TestOrdersPatchEndpoint:
@@ -338,6 +448,27 @@ class TestOrdersPatchEndpoint:
         resp = api_client.patch(f"{self.base}{order.id}/", {"status": "not_a_valid_status"}, format="json")
         assert resp.status_code == 400
 
+    def test_owner_patch_does_not_load_users(self, api_client, create_user, django_assert_num_queries):
+        customer = create_user("cust_patch_queries", user_type="customer")
+        business = create_user("biz_patch_queries", user_type="business")
+        order = safe_create_order(
+            customer_user=customer,
+            business_user=business,
+            title="PatchQueries",
+            revisions=1,
+            delivery_time_in_days=2,
+            price=50,
+            features=[],
+            offer_type="basic",
+            status="in_progress",
+        )
+        api_client.force_authenticate(user=business)
+        with django_assert_num_queries(2):
+            resp = api_client.patch(f"{self.base}{order.id}/", {"status": "cancelled"}, format="json")
+        assert resp.status_code == 200
+        order.refresh_from_db()
+        assert order.status == "cancelled"
+
     def test_patch_non_existing_order_returns_404(self, api_client, create_user):
         business = create_user("biz_patch_nonexist", user_type="business")
         api_client.force_authenticate(user=business)
@@ -514,3 +645,30 @@ class TestOrderCountEndpoints:
         assert resp.status_code == 404
         resp2 = api_client.get(self.completed_count_url.format(business_user_id=999999))
         assert resp2.status_code == 404
+
+    def test_counts_are_cached_until_an_order_changes(self, api_client, create_user, django_assert_num_queries, django_capture_on_commit_callbacks):
+        business = create_user("countbiz_cache", user_type="business")
+        cust = create_user("countcust_cache", user_type="customer")
+        order = safe_create_order(
+            customer_user=cust,
+            business_user=business,
+            title="Cached",
+            revisions=1,
+            delivery_time_in_days=2,
+            price=50,
+            features=[],
+            offer_type="basic",
+            status="in_progress",
+        )
+        api_client.force_authenticate(user=cust)
+        assert api_client.get(self.order_count_url.format(business_user_id=business.id)).json()["order_count"] == 1
+        with django_assert_num_queries(0):
+            resp = api_client.get(self.completed_count_url.format(business_user_id=business.id))
+        assert resp.json()["completed_order_count"] == 0
+
+        order.status = "completed"
+        with django_capture_on_commit_callbacks(execute=True):
+            order.save()
+            assert api_client.get(self.order_count_url.format(business_user_id=business.id)).json()["order_count"] == 1
+        assert api_client.get(self.order_count_url.format(business_user_id=business.id)).json()["order_count"] == 0
+        assert api_client.get(self.completed_count_url.format(business_user_id=business.id)).json()["completed_order_count"] == 1
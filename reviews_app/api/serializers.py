@@ -5,12 +5,19 @@ This module provides serializers for converting Review model instances to/from J
 It includes both read and write serializers for different review operations.
 """
 
-from django.shortcuts import get_object_or_404
 from rest_framework import serializers
 
+from core.serializers import rows_to_dicts
 from reviews_app.models import Review
-from user_auth_app.api.serializers import UserProfileSerializer
-from user_auth_app.models import UserProfile
+
+REVIEW_LIST_KEYS = ('id', 'business_user', 'reviewer', 'rating', 'description', 'created_at', 'updated_at')
+REVIEW_LIST_COLUMNS = ('id', 'business_user_id', 'reviewer_id', 'rating', 'description', 'created_at', 'updated_at')
+
+
+def serialize_review_list(reviews):
+    """Render a review queryset like ReviewSerializer(many=True) from plain column tuples."""
+    return rows_to_dicts(reviews, REVIEW_LIST_KEYS, REVIEW_LIST_COLUMNS, datetime_keys=('created_at', 'updated_at'))
+
 
 
 class ReviewSerializer(serializers.ModelSerializer):
@@ -28,8 +35,8 @@ class ReviewCreateSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Review
-        fields = ['business_user', 'reviewer', 'rating', 'description']
-        read_only_fields = ['reviewer']
+        fields = ['id', 'business_user', 'reviewer', 'rating', 'description', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'reviewer', 'created_at', 'updated_at']
 
     def validate_rating(self, value):
         """Validate that the rating is between 1 and 5 inclusive."""
@@ -37,19 +44,19 @@ class ReviewCreateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError('rating must be between 1 and 5')
         return value
     
-    def validate(self, attrs):
-        return super().validate(attrs)
-    
     def create(self, validated_data):
         """Create a new review instance."""
-        request_user = self.context['request'].user
-        reviewer = get_object_or_404(UserProfile, id=request_user.id)
         review = Review.objects.create(
-            business_user=validated_data['business_user'],
-            reviewer=reviewer,
+            business_user_id=validated_data['business_user'].pk,
+            reviewer_id=self.context['request'].user.pk,
             rating=validated_data['rating'],
             description=validated_data.get('description', '')
         )
         return review
-    
-    
\ No newline at end of file
+
+    def update(self, instance, validated_data):
+        """Update a review, writing only the submitted columns and the timestamp."""
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(update_fields=[*validated_data, 'updated_at'])
+        return instance
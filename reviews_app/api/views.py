@@ -5,15 +5,49 @@ This module provides API views for managing reviews in the application.
 It includes endpoints for listing, creating, updating, and deleting reviews.
 """
 
+import hashlib
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.dateparse import parse_datetime
 from rest_framework import permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from reviews_app.models import Review
-from user_auth_app.models import UserProfile
+from core.serializers import format_datetime
+from reviews_app.models import REVIEW_LIST_CACHE_KEY, Review
 
 from .permissions import IsBusinessUser, IsCustomerUser, IsOwnerOrAdminOrReadOnly
-from .serializers import ReviewCreateSerializer, ReviewSerializer
+from .serializers import ReviewCreateSerializer, ReviewSerializer, serialize_review_list
+
+REVIEW_ORDERINGS = frozenset({'rating', '-rating', 'updated_at', '-updated_at'})
+REVIEW_LIST_CACHE_TIMEOUT = 60
+
+
+def review_list_etag(params, count, latest):
+    """
+    Build a weak ETag for a review list from its size and latest change.
+
+    Adding or editing a review moves the latest updated_at, deleting one changes
+    the count, so the tag changes whenever the listed rows do.
+    """
+    digest = hashlib.md5(repr((params, count, latest)).encode()).hexdigest()
+    return f'W/"{digest}"'
+
+
+def review_list_etag_for_data(params, data):
+    """Compute the ETag of an already serialized review list without a query."""
+    latest = max((item['updated_at'] for item in data), key=parse_datetime, default=None)
+    return review_list_etag(params, len(data), latest)
+
+
+def review_list_etag_for_queryset(params, reviews):
+    """Compute the ETag of a review list with one aggregate query instead of fetching its rows."""
+    stats = reviews.aggregate(count=Count('id'), latest=Max('updated_at'))
+    latest = stats['latest'] and format_datetime(stats['latest'])
+    return review_list_etag(params, stats['count'], latest)
 
 
 class ReviewsView(APIView):
@@ -33,6 +67,10 @@ class ReviewsView(APIView):
             reviewer_id: Filter reviews by reviewer user ID
             ordering: Order results by 'rating', '-rating', 'updated_at', or '-updated_at'
 
+        The unfiltered list is cached until a review is saved or deleted. Every
+        response carries an ETag; a matching If-None-Match is answered with 304
+        before any review rows are fetched.
+
         Returns:
             Response: List of serialized review objects
         """
@@ -40,14 +78,36 @@ class ReviewsView(APIView):
         business_user_id = request.query_params.get('business_user_id')
         reviewer_id = request.query_params.get('reviewer_id')
         ordering = request.query_params.get('ordering')
-        if ordering in ['rating', '-rating', 'updated_at', '-updated_at']:
+        if not (business_user_id or reviewer_id or ordering in REVIEW_ORDERINGS):
+            etag, data = cache.get_or_set(REVIEW_LIST_CACHE_KEY, lambda: self.build_list(qs, ()), REVIEW_LIST_CACHE_TIMEOUT)
+            return get_conditional_response(request, etag=etag) or self.etagged(Response(data), etag)
+        if ordering in REVIEW_ORDERINGS:
             qs = qs.order_by(ordering)
+        else:
+            ordering = None
         if business_user_id:
-            qs = qs.filter(business_user__id=business_user_id)
+            qs = qs.filter(business_user_id=business_user_id)
         if reviewer_id:
-            qs = qs.filter(reviewer__id=reviewer_id)
-        serializer = ReviewSerializer(qs, many=True)
-        return Response(serializer.data)
+            qs = qs.filter(reviewer_id=reviewer_id)
+        params = (business_user_id, reviewer_id, ordering)
+        if 'HTTP_IF_NONE_MATCH' in request.META:
+            not_modified = get_conditional_response(request, etag=review_list_etag_for_queryset(params, qs))
+            if not_modified:
+                return not_modified
+        etag, data = self.build_list(qs, params)
+        return self.etagged(Response(data), etag)
+
+    @staticmethod
+    def build_list(reviews, params):
+        """Serialize a review list and compute its ETag from the serialized rows."""
+        data = serialize_review_list(reviews)
+        return review_list_etag_for_data(params, data), data
+
+    @staticmethod
+    def etagged(response, etag):
+        """Attach the list ETag to a response."""
+        response['ETag'] = etag
+        return response
 
     def post(self, request):
         """
@@ -66,21 +126,22 @@ class ReviewsView(APIView):
         if serializer.is_valid():
             if not request.user or not request.user.is_authenticated:
                 return Response({'detail': 'Authentication required to create reviews'}, status=status.HTTP_403_FORBIDDEN)
-            if Review.objects.filter(business_user__id=request.data.get('business_user'), reviewer__id=request.user.id).exists():
-                return Response({'detail': 'You have already reviewed this business user'}, status=status.HTTP_403_FORBIDDEN)
             if request.user.type != 'customer':
                 return Response({'detail': 'Only customers can create reviews'}, status=status.HTTP_403_FORBIDDEN)
-            if request.data.get('business_user') and UserProfile.objects.filter(id=request.data.get('business_user')).exists():
-                business_user = UserProfile.objects.get(id=request.data.get('business_user'))
-                if business_user.type != 'business':
-                    return Response({'detail': 'You can only review business users'}, status=status.HTTP_400_BAD_REQUEST)
-            review = serializer.save()
-            return Response(ReviewSerializer(review).data, status=status.HTTP_201_CREATED)
+            if serializer.validated_data['business_user'].type != 'business':
+                return Response({'detail': 'You can only review business users'}, status=status.HTTP_400_BAD_REQUEST)
+            try:
+                with transaction.atomic():
+                    serializer.save()
+            except IntegrityError:
+                return Response({'detail': 'You have already reviewed this business user'}, status=status.HTTP_403_FORBIDDEN)
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
 class ReviewDetailView(APIView):
     """API view for retrieving, updating, and deleting individual reviews."""
+    permission_classes = [IsOwnerOrAdminOrReadOnly]
 
     def get_object(self, pk):
         """Retrieve a review object by primary key."""
@@ -89,6 +150,30 @@ class ReviewDetailView(APIView):
         except Review.DoesNotExist:
             return None
 
+    def get_owned_object(self, request, pk, action, fields=None):
+        """
+        Retrieve a review the requesting user may modify.
+
+        Ownership is part of the lookup, so the common case costs a single query;
+        only a miss checks whether the review exists at all to pick 403 or 404.
+        Pass fields to load a narrower row when the handler needs less.
+
+        Returns:
+            tuple: (review, None) on success, (None, error Response) otherwise
+        """
+        reviews = Review.objects.filter(pk=pk)
+        if fields:
+            reviews = reviews.only(*fields)
+        if request.user.is_superuser:
+            review = reviews.first()
+        else:
+            review = reviews.filter(reviewer_id=request.user.pk).first()
+        if review:
+            return review, None
+        if request.user.is_superuser or not reviews.exists():
+            return None, Response({'error': 'Review not found'}, status=status.HTTP_404_NOT_FOUND)
+        return None, Response({'error': f'You do not have permission to {action} this review'}, status=status.HTTP_403_FORBIDDEN)
+
     def get(self, request, pk):
         """Retrieve a specific review by ID."""
         review = self.get_object(pk)
@@ -107,27 +192,24 @@ class ReviewDetailView(APIView):
 
     def _update(self, request, pk, partial):
         """Internal method to handle both PUT and PATCH updates for reviews."""
-        self.permission_classes = [IsOwnerOrAdminOrReadOnly]
-        review = self.get_object(pk)
-        if not review:
-            return Response({'error': 'Review not found'}, status=status.HTTP_404_NOT_FOUND)
-        if request.user != review.reviewer and not request.user.is_superuser:
-            return Response({'error': 'You do not have permission to edit this review'}, status=status.HTTP_403_FORBIDDEN)
+        review, error = self.get_owned_object(request, pk, 'edit')
+        if error:
+            return error
         serializer = ReviewCreateSerializer(review, data=request.data, partial=partial, context={'request': request})
         if serializer.is_valid():
-            updated = serializer.save()
-            response = ReviewSerializer(updated).data
-            return Response(response, status=status.HTTP_200_OK)
+            try:
+                with transaction.atomic():
+                    serializer.save()
+            except IntegrityError:
+                return Response({'detail': 'You have already reviewed this business user'}, status=status.HTTP_403_FORBIDDEN)
+            return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     def delete(self, request, pk):
         """Delete a specific review."""
-        self.permission_classes = [IsOwnerOrAdminOrReadOnly]
-        review = self.get_object(pk)
-        if not review:
-            return Response({'error': 'Review not found'}, status=status.HTTP_404_NOT_FOUND)
-        if request.user != review.reviewer and not request.user.is_superuser:
-            return Response({'error': 'You do not have permission to delete this review'}, status=status.HTTP_403_FORBIDDEN)
+        review, error = self.get_owned_object(request, pk, 'delete', fields=('id', 'reviewer_id'))
+        if error:
+            return error
         review.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
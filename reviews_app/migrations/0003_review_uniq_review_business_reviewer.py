@@ -0,0 +1,34 @@
+# Generated by Django 6.0 on 2026-10-16 00:45
+
+from django.db import migrations, models
+
+
+def delete_duplicate_reviews(apps, schema_editor):
+    """Keep only the most recently updated review per business user and reviewer."""
+    Review = apps.get_model('reviews_app', 'Review')
+    seen = set()
+    duplicate_ids = []
+    rows = Review.objects.order_by('business_user_id', 'reviewer_id', '-updated_at', '-id').values_list(
+        'id', 'business_user_id', 'reviewer_id'
+    )
+    for review_id, business_user_id, reviewer_id in rows.iterator():
+        if (business_user_id, reviewer_id) in seen:
+            duplicate_ids.append(review_id)
+        else:
+            seen.add((business_user_id, reviewer_id))
+    Review.objects.filter(id__in=duplicate_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews_app', '0002_review_filter_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_reviews, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='review',
+            constraint=models.UniqueConstraint(fields=('business_user', 'reviewer'), name='uniq_review_business_reviewer'),
+        ),
+    ]
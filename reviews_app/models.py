@@ -1,6 +1,13 @@
-from django.db import models
+from functools import partial
+
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from user_auth_app.models import UserProfile
 
+REVIEW_LIST_CACHE_KEY = 'reviews:list:v1'
+
 class Review(models.Model):
     business_user = models.ForeignKey(UserProfile, related_name='reviews', on_delete=models.CASCADE)
     reviewer = models.ForeignKey(UserProfile, related_name='given_reviews', on_delete=models.CASCADE)
@@ -8,3 +15,21 @@ class Review(models.Model):
     description = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['business_user', 'updated_at'], name='review_business_updated_idx'),
+            models.Index(fields=['business_user', 'rating'], name='review_business_rating_idx'),
+            models.Index(fields=['reviewer', 'updated_at'], name='review_reviewer_updated_idx'),
+            models.Index(fields=['reviewer', 'rating'], name='review_reviewer_rating_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['business_user', 'reviewer'], name='uniq_review_business_reviewer'),
+        ]
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_review_list(sender, **kwargs):
+    """Drop the cached unfiltered review list after a review changes."""
+    transaction.on_commit(partial(cache.delete, REVIEW_LIST_CACHE_KEY))
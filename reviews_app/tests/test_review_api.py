@@ -3,6 +3,9 @@ from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
 
+from reviews_app.api.serializers import ReviewSerializer
+from reviews_app.models import Review
+
 @pytest.fixture
 def client():
     return APIClient()
@@ -179,4 +182,141 @@ def test_delete_review_forbidden(authenticated_client, client, django_user_model
     url = reverse('review-detail', args=[review_id])
     response = authenticated_client.delete(url)
 
-    assert response.status_code == status.HTTP_403_FORBIDDEN
\ No newline at end of file
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_get_reviews_filtered_list_uses_single_query(authenticated_client, authenticated_user, business_user, django_user_model, django_assert_num_queries):
+    other_user = django_user_model.objects.create_user(
+        username='other', password='secret', email='other@example.com', type='customer'
+    )
+    Review.objects.create(business_user=business_user, reviewer=authenticated_user, rating=2, description="Ok")
+    Review.objects.create(business_user=business_user, reviewer=other_user, rating=5, description="Great")
+    url = reverse('reviews-list')
+    with django_assert_num_queries(1):
+        response = authenticated_client.get(url, {'business_user_id': business_user.id, 'ordering': '-rating'})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [review['rating'] for review in response.json()] == [5, 2]
+    assert [review['reviewer'] for review in response.json()] == [other_user.id, authenticated_user.id]
+
+@pytest.mark.django_db
+def test_post_review_for_customer_user_rejected(authenticated_client, django_user_model):
+    customer = django_user_model.objects.create_user(
+        username='customer2', password='secret', email='customer2@example.com', type='customer'
+    )
+    url = reverse('reviews-list')
+    data = {"business_user": customer.id, "rating": 4, "description": "Nope"}
+    response = authenticated_client.post(url, data, format='json')
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+@pytest.mark.django_db
+def test_post_review_queries(authenticated_client, business_user, django_assert_max_num_queries):
+    url = reverse('reviews-list')
+    data = {"business_user": business_user.id, "rating": 4, "description": "Fast"}
+    with django_assert_max_num_queries(4):
+        response = authenticated_client.post(url, data, format='json')
+
+    assert response.status_code == status.HTTP_201_CREATED
+
+@pytest.mark.django_db
+def test_get_reviews_matches_review_serializer(authenticated_client, authenticated_user, business_user):
+    Review.objects.create(business_user=business_user, reviewer=authenticated_user, rating=4, description="Solid")
+    response = authenticated_client.get(reverse('reviews-list'))
+
+    expected = ReviewSerializer(Review.objects.all(), many=True).data
+    assert response.json() == [dict(item) for item in expected]
+
+@pytest.mark.django_db
+def test_delete_review_queries(authenticated_client, authenticated_user, business_user, django_assert_num_queries):
+    review = Review.objects.create(business_user=business_user, reviewer=authenticated_user, rating=3, description="Bye")
+    url = reverse('review-detail', args=[review.id])
+    with django_assert_num_queries(2) as captured:
+        response = authenticated_client.delete(url)
+
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert '"description"' not in captured.captured_queries[0]['sql']
+    assert not Review.objects.filter(pk=review.id).exists()
+
+@pytest.mark.django_db
+def test_delete_missing_review_not_found(authenticated_client):
+    response = authenticated_client.delete(reverse('review-detail', args=[999]))
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+@pytest.mark.django_db
+def test_post_and_patch_review_match_review_serializer(authenticated_client, business_user):
+    url = reverse('reviews-list')
+    response = authenticated_client.post(url, {"business_user": business_user.id, "rating": 4, "description": "Good"}, format='json')
+
+    assert response.status_code == status.HTTP_201_CREATED
+    review = Review.objects.get(pk=response.json()['id'])
+    assert response.json() == ReviewSerializer(review).data
+
+    response = authenticated_client.patch(reverse('review-detail', args=[review.id]), {"rating": 5}, format='json')
+
+    assert response.status_code == status.HTTP_200_OK
+    review.refresh_from_db()
+    assert response.json() == ReviewSerializer(review).data
+
+@pytest.mark.django_db
+def test_patch_review_updates_only_given_fields(authenticated_client, authenticated_user, business_user, django_assert_num_queries):
+    review = Review.objects.create(business_user=business_user, reviewer=authenticated_user, rating=2, description="Meh")
+    url = reverse('review-detail', args=[review.id])
+    with django_assert_num_queries(4) as captured:
+        response = authenticated_client.patch(url, {"rating": 4}, format='json')
+
+    assert response.status_code == status.HTTP_200_OK
+    update_sql = next(q['sql'] for q in captured.captured_queries if q['sql'].startswith('UPDATE'))
+    assert '"rating"' in update_sql and '"description"' not in update_sql
+    review.refresh_from_db()
+    assert (review.rating, review.description) == (4, "Meh")
+    assert response.json()['updated_at'] != response.json()['created_at']
+
+@pytest.mark.django_db
+def test_get_reviews_unfiltered_list_is_cached(authenticated_client, authenticated_user, business_user, django_assert_num_queries, django_capture_on_commit_callbacks):
+    review = Review.objects.create(business_user=business_user, reviewer=authenticated_user, rating=3, description="Cached")
+    url = reverse('reviews-list')
+    assert len(authenticated_client.get(url).json()) == 1
+    with django_assert_num_queries(0):
+        response = authenticated_client.get(url)
+
+    assert [item['id'] for item in response.json()] == [review.id]
+    with django_capture_on_commit_callbacks(execute=True):
+        review.delete()
+    assert authenticated_client.get(url).json() == []
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('params', [{}, {'reviewer_id': 'self', 'ordering': '-rating'}])
+def test_get_reviews_not_modified(authenticated_client, authenticated_user, business_user, django_assert_num_queries, django_capture_on_commit_callbacks, params):
+    review = Review.objects.create(business_user=business_user, reviewer=authenticated_user, rating=3, description="Tagged")
+    params = {key: authenticated_user.id if value == 'self' else value for key, value in params.items()}
+    url = reverse('reviews-list')
+    response = authenticated_client.get(url, params)
+    etag = response['ETag']
+
+    with django_assert_num_queries(1 if params else 0):
+        response = authenticated_client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    review.rating = 4
+    with django_capture_on_commit_callbacks(execute=True):
+        review.save()
+    response = authenticated_client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert response['ETag'] != etag
+
+@pytest.mark.django_db
+def test_patch_review_to_already_reviewed_business_rejected(authenticated_client, authenticated_user, business_user, django_user_model):
+    other_business = django_user_model.objects.create_user(
+        username='otherbiz', password='secret', email='otherbiz@example.com', type='business'
+    )
+    Review.objects.create(business_user=business_user, reviewer=authenticated_user, rating=4, description="First")
+    review = Review.objects.create(business_user=other_business, reviewer=authenticated_user, rating=2, description="Second")
+    url = reverse('review-detail', args=[review.id])
+    response = authenticated_client.patch(url, {"business_user": business_user.id}, format='json')
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    review.refresh_from_db()
+    assert review.business_user_id == other_business.id
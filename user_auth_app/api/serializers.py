@@ -5,25 +5,93 @@ This module provides serializers for user profile management and authentication.
 It includes serializers for user registration, profile display, and user data conversion.
 """
 
+from django.db import IntegrityError, transaction
+from django.db import models
+from django.db.models import Q
 from rest_framework import serializers
+from rest_framework.authtoken.serializers import AuthTokenSerializer
 
+from core.serializers import rows_to_dicts
 from user_auth_app.models import UserProfile
 
+
+USER_TYPES = frozenset({'business', 'customer'})
+LOGIN_FIELDS = ('user', 'username', 'password', 'email', 'type', 'is_active', 'is_staff', 'is_superuser', 'last_login')
+PROFILE_LIST_KEYS = (
+    'user', 'username', 'first_name', 'last_name', 'file', 'location', 'tel',
+    'description', 'working_hours', 'type', 'email', 'created_at',
+)
+PROFILE_LIST_COLUMNS = (
+    'user', 'username', 'first_name', 'last_name', 'file', 'location', 'tel',
+    'description', 'working_hours', 'type', 'email', 'date_joined',
+)
+CUSTOMER_LIST_KEYS = ('user', 'username', 'first_name', 'last_name', 'file', 'uploaded_at', 'type')
+CUSTOMER_LIST_COLUMNS = ('user', 'username', 'first_name', 'last_name', 'file', 'date_joined', 'type')
+
+
+def unique_error_message(field_name):
+    """Return the message DRF's UniqueValidator reports for a UserProfile field."""
+    model_field = UserProfile._meta.get_field(field_name)
+    return model_field.error_messages['unique'] % {
+        'model_name': UserProfile._meta.verbose_name,
+        'field_label': model_field.verbose_name,
+    }
+
+
+def serialize_profile_list(profiles, keys, columns, request=None):
+    """
+    Render a profile queryset like UserProfileSerializer(many=True) from plain column tuples.
+
+    keys name the output fields for the given columns; the file column becomes an
+    absolute URL, date_joined is formatted by DRF's DateTimeField and missing values
+    are rendered as '' like the serializer does.
+    """
+    file_url = UserProfile._meta.get_field('file').storage.url
+    joined_key = keys[columns.index('date_joined')]
+    data = rows_to_dicts(profiles, keys, columns, datetime_keys=(joined_key,))
+    for item in data:
+        for key, value in item.items():
+            if value is None:
+                item[key] = ''
+        if item['file']:
+            url = file_url(item['file'])
+            item['file'] = request.build_absolute_uri(url) if request else url
+    return data
+
+
+class NullToEmptyMixin:
+    """Serializer field mixin that renders missing values as empty strings."""
+
+    def get_attribute(self, instance):
+        value = super().get_attribute(instance)
+        return '' if value is None else value
+
+    def to_representation(self, value):
+        value = super().to_representation(value)
+        return '' if value is None else value
+
+
+class NullToEmptyCharField(NullToEmptyMixin, serializers.CharField):
+    pass
+
+
+class NullToEmptyFileField(NullToEmptyMixin, serializers.FileField):
+    pass
+
+
 class UserProfileSerializer(serializers.ModelSerializer):
-    """Serializer for UserProfile model."""
+    """Serializer for UserProfile model; empty profile fields are rendered as ''."""
+    serializer_field_mapping = {
+        **serializers.ModelSerializer.serializer_field_mapping,
+        models.CharField: NullToEmptyCharField,
+        models.TextField: NullToEmptyCharField,
+        models.FileField: NullToEmptyFileField,
+    }
     created_at = serializers.DateTimeField(source='date_joined', read_only=True)
 
     class Meta:
         model = UserProfile
         fields = ['user', 'username', 'first_name', 'last_name', 'file', 'location', 'tel', 'description', 'working_hours', 'type', 'email', 'created_at']
-
-    def to_representation(self, instance):
-        """Convert None and empty values to empty strings."""
-        data = super().to_representation(instance)
-        for key, value in list(data.items()):
-            if value is None or (isinstance(value, (list, dict)) and len(value) == 0):
-                data[key] = ''
-        return data
     
 class UserCustomerSerializer(UserProfileSerializer):
     """Serializer for customer user profiles."""
@@ -48,19 +116,35 @@ class RegistrationSerializer(serializers.ModelSerializer):
             'password': {
                 'write_only': True, 
                 'min_length': 8
-            }
+            },
+            'username': {'validators': []},
+            'email': {'validators': []},
         }
 
+    def uniqueness_errors(self):
+        """Report which of username and email are already taken, in a single query."""
+        username = self.validated_data['username']
+        email = self.validated_data['email']
+        clashes = UserProfile.objects.filter(Q(username=username) | Q(email=email)).values_list('username', 'email')
+        errors = {}
+        for taken_username, taken_email in clashes:
+            if taken_username == username:
+                errors['username'] = [unique_error_message('username')]
+            if taken_email == email:
+                errors['email'] = [unique_error_message('email')]
+        return errors
+
     def save(self):
         """
         Create and save a new user account.
 
         Validates that:
         - Passwords match
-        - Email is unique
-        - Username is unique
         - User type is valid ('business' or 'customer')
 
+        Username and email uniqueness is left to the database constraints; the
+        taken fields are only looked up when the insert fails.
+
         Returns:
             UserProfile: The newly created user profile
 
@@ -70,22 +154,36 @@ class RegistrationSerializer(serializers.ModelSerializer):
         pw= self.validated_data['password']
         repeated_pw = self.validated_data['repeated_password']
         type = self.validated_data['type']
-        users = UserProfile.objects.filter(username=self.validated_data['username'])
-        emails = UserProfile.objects.filter(email=self.validated_data['email'])
-
-        if emails.exists():
-            raise serializers.ValidationError({'error':'email already in use'})
-
-        if users.exists():
-            raise serializers.ValidationError({'error':'username already in use'})
 
         if pw != repeated_pw:
             raise serializers.ValidationError({'error':'passwords don`t match'})
 
-        if type not in ['business', 'customer']:
+        if type not in USER_TYPES:
             raise serializers.ValidationError({'error':'type must be business or customer'})
 
         account = UserProfile(email=self.validated_data['email'], username=self.validated_data['username'], type=type)
         account.set_password(pw)
-        account.save()
+        try:
+            with transaction.atomic():
+                account.save()
+        except IntegrityError:
+            raise serializers.ValidationError(self.uniqueness_errors() or {'error': 'username or email already in use'})
         return account
+
+class LoginSerializer(AuthTokenSerializer):
+    """Login credentials serializer that loads only the columns authentication and the login response read."""
+
+    def validate(self, attrs):
+        """Authenticate like ModelBackend, but against a narrowed user row."""
+        username = attrs.get('username')
+        password = attrs.get('password')
+        if not (username and password):
+            return super().validate(attrs)
+        user = UserProfile.objects.only(*LOGIN_FIELDS).filter(username=username).first()
+        if user is None:
+            # Hash anyway so unknown usernames take as long as wrong passwords.
+            UserProfile().set_password(password)
+        elif user.check_password(password) and user.is_active:
+            attrs['user'] = user
+            return attrs
+        raise serializers.ValidationError('Unable to log in with provided credentials.', code='authorization')
@@ -5,38 +5,73 @@ This module provides API views for user authentication and profile management.
 It includes endpoints for user registration, login, and profile listing/management.
 """
 
+from django.db import IntegrityError, transaction
 from rest_framework import generics
 from rest_framework.authtoken.models import Token
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.permissions import AllowAny
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from core.renderers import ORJSONRenderer
 from user_auth_app.models import UserProfile
+from user_auth_app.utils.validators import MAX_FILE_SIZE, MAX_FILE_SIZE_MB
 
 from .permissions import IsAdminOrOwnerOrReadOnly
 from .serializers import (
+    CUSTOMER_LIST_COLUMNS,
+    CUSTOMER_LIST_KEYS,
+    PROFILE_LIST_COLUMNS,
+    PROFILE_LIST_KEYS,
+    LoginSerializer,
     RegistrationSerializer,
     UserCustomerSerializer,
     UserProfileSerializer,
+    serialize_profile_list,
 )
 
-class UserProfileListBusiness(generics.ListCreateAPIView):
+# Room for the other form fields and multipart boundaries around a maximum-size file.
+MAX_PROFILE_BODY_SIZE = MAX_FILE_SIZE + 64 * 1024
+
+class ProfileListView(generics.ListCreateAPIView):
+    """Base view for the profile lists, rendered from column tuples instead of serializer instances."""
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
+    list_keys = PROFILE_LIST_KEYS
+    list_columns = PROFILE_LIST_COLUMNS
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(serialize_profile_list(queryset, self.list_keys, self.list_columns, request))
+
+class UserProfileListBusiness(ProfileListView):
     """API view for listing and creating business user profiles."""
     queryset = UserProfile.objects.filter(type='business')
     serializer_class = UserProfileSerializer
 
-class UserProfileListCustomer(generics.ListCreateAPIView):
+class UserProfileListCustomer(ProfileListView):
     """API view for listing and creating customer user profiles."""
     queryset = UserProfile.objects.filter(type='customer')
     serializer_class = UserCustomerSerializer
+    list_keys = CUSTOMER_LIST_KEYS
+    list_columns = CUSTOMER_LIST_COLUMNS
 
 class UserProfileDetail(generics.RetrieveUpdateDestroyAPIView):
     """API view for retrieving, updating, and deleting user profiles."""
-    queryset = UserProfile.objects.all()
+    queryset = UserProfile.objects.only(*PROFILE_LIST_COLUMNS)
     permission_classes = [IsAdminOrOwnerOrReadOnly]
     serializer_class = UserProfileSerializer
 
+    def update(self, request, *args, **kwargs):
+        """Reject oversized uploads from their Content-Length before the body is parsed."""
+        try:
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except (TypeError, ValueError):
+            length = 0
+        if length > MAX_PROFILE_BODY_SIZE:
+            return Response({'error': f'File too large. Size should not exceed {MAX_FILE_SIZE_MB} MB.'}, status=413)
+        return super().update(request, *args, **kwargs)
+
 class RegistrationView(APIView):
     """
     API view for user registration.
@@ -63,7 +98,7 @@ class RegistrationView(APIView):
 
         if serializer.is_valid():
             saved_account = serializer.save()
-            token, created = Token.objects.get_or_create(user=saved_account)
+            token = Token.objects.create(user=saved_account)
             data = {
                 'token': token.key,
                 'username': saved_account.username,
@@ -84,6 +119,7 @@ class CustomLoginView(ObtainAuthToken):
     authentication token and additional user details upon successful login.
     """
     permission_classes = [AllowAny]
+    serializer_class = LoginSerializer
 
     def post(self, request):
         """
@@ -102,15 +138,22 @@ class CustomLoginView(ObtainAuthToken):
         data = {}
         if serializer.is_valid():
             user = serializer.validated_data['user']
-            token, created = Token.objects.get_or_create(user=user)
+            if not user.is_active:
+                return Response({'error': 'User account is disabled.'}, status=403)
+            key = Token.objects.filter(user=user).values_list('key', flat=True).first()
+            if key is None:
+                try:
+                    with transaction.atomic():
+                        key = Token.objects.create(user=user).key
+                except IntegrityError:
+                    # A concurrent login created the token first.
+                    key = Token.objects.get_or_create(user=user)[0].key
             data = {
-                'token': token.key,
+                'token': key,
                 'username': user.username,
                 'email': user.email,
                 'user_id': user.user
             }
-            if not user.is_active:
-                return Response({'error': 'User account is disabled.'}, status=403)
         else:
             data = serializer.errors
             status=400
@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-15 22:41
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_auth_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='userprofile',
+            name='id',
+        ),
+    ]
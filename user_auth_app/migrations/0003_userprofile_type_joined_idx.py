@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-15 22:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_auth_app', '0002_remove_userprofile_id'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(fields=['type', '-date_joined'], name='up_type_joined_idx'),
+        ),
+    ]
@@ -3,7 +3,6 @@ from django.db import models
 
 class UserProfile(AbstractUser):
     user = models.AutoField(primary_key=True)
-    id = models.IntegerField(null=True, editable=False, unique=True)
     username = models.CharField(max_length=150, unique=True)
     location = models.CharField(max_length=100, blank=True, null=True)
     file = models.FileField(upload_to='user_files/', blank=True, null=True)
@@ -13,12 +12,16 @@ class UserProfile(AbstractUser):
     type = models.CharField(max_length=50)
     email = models.EmailField(unique=True)
     created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=['type', '-date_joined'], name='up_type_joined_idx'),
+        ]
     
-    def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
-        if self.id != self.user:
-            self.id = self.user
-            super().save(update_fields=['id'])
+    @property
+    def id(self):
+        """Alias of the primary key for code that expects an ``id`` attribute."""
+        return self.user
 
     def __str__(self):
-        return self.username
\ No newline at end of file
+        return self.username
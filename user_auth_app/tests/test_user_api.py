@@ -1,9 +1,16 @@
 import pytest
 from django.urls import reverse
-from rest_framework.test import APIClient
+from rest_framework.test import APIClient, APIRequestFactory
 from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.authtoken.models import Token
 
+from user_auth_app.api import serializers
+from user_auth_app.api.views import MAX_PROFILE_BODY_SIZE
+from user_auth_app.utils.validators import MAX_FILE_SIZE, MAX_FILE_SIZE_MB
+
 pytestmark = pytest.mark.django_db
 
 User = get_user_model()
@@ -98,3 +105,172 @@ def test_user_detail_edit_permissions_owner():
     resp = client.patch(detail_url, {"username": "owner-changed"}, format="json")
     assert resp.status_code in (200, 202)
     assert resp.json().get("username") == "owner-changed"
+
+def test_registration_duplicate_username_and_email_returns_400():
+    create_user("takenuser", email="taken@example.com")
+    client = APIClient()
+    payload = {
+        "username": "takenuser",
+        "email": "taken@example.com",
+        "password": "verysecure123",
+        "repeated_password": "verysecure123",
+        "type": "customer",
+    }
+    resp = client.post(reverse("registration"), payload, format="json")
+    assert resp.status_code == 400
+    assert resp.json() == {
+        "username": ["user with this username already exists."],
+        "email": ["user with this email already exists."],
+    }
+
+def test_registration_skips_uniqueness_queries_on_success():
+    client = APIClient()
+    payload = {
+        "username": "onequery",
+        "email": "onequery@example.com",
+        "password": "verysecure123",
+        "repeated_password": "verysecure123",
+        "type": "business",
+    }
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.post(reverse("registration"), payload, format="json")
+    assert resp.status_code == 201
+    profile_selects = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("SELECT") and "user_auth_app_userprofile" in q["sql"]]
+    assert profile_selects == []
+
+def test_profiles_business_list_loads_only_serialized_columns(django_assert_num_queries):
+    create_user("bizlist", type="business", location="Berlin")
+    viewer = create_user("viewer")
+    client = APIClient()
+    client.force_authenticate(user=viewer)
+    with django_assert_num_queries(1) as captured:
+        resp = client.get(reverse("userprofile-business-list"))
+    assert resp.status_code == 200
+    assert [(p["username"], p["location"]) for p in resp.json()] == [("bizlist", "Berlin")]
+    assert '"password"' not in captured.captured_queries[0]["sql"]
+
+def test_user_detail_patch_with_deferred_columns_keeps_password():
+    owner = create_user("deferowner", password="keep-this-pass")
+    client = APIClient()
+    client.force_authenticate(user=owner)
+    resp = client.patch(reverse("userprofile-detail", args=[owner.user]), {"location": "Hamburg"}, format="json")
+    assert resp.status_code == 200
+    owner.refresh_from_db()
+    assert owner.location == "Hamburg"
+    assert owner.check_password("keep-this-pass")
+
+def test_user_detail_missing_profile_returns_404():
+    viewer = create_user("lookup")
+    client = APIClient()
+    client.force_authenticate(user=viewer)
+    assert client.get(reverse("userprofile-detail", args=[9999])).status_code == 404
+
+def test_profile_empty_fields_render_as_empty_strings():
+    owner = create_user("emptyfields", type="business")
+    client = APIClient()
+    client.force_authenticate(user=owner)
+    data = client.get(reverse("userprofile-detail", args=[owner.user])).json()
+    for key in ("first_name", "last_name", "file", "location", "tel", "description", "working_hours"):
+        assert data[key] == ""
+    create_user("emptycustomer")
+    customers = client.get(reverse("userprofile-customer-list")).json()
+    assert [(c["first_name"], c["file"]) for c in customers] == [("", "")]
+
+@pytest.mark.parametrize("url_name, user_type, serializer_name", [
+    ("userprofile-business-list", "business", "UserProfileSerializer"),
+    ("userprofile-customer-list", "customer", "UserCustomerSerializer"),
+])
+def test_profiles_list_matches_serializer(url_name, user_type, serializer_name):
+    create_user(f"{user_type}1", type=user_type, location="Bonn", file="user_files/avatar.png")
+    create_user(f"{user_type}2", type=user_type)
+    client = APIClient()
+    client.force_authenticate(user=create_user("viewer", type="staff"))
+    resp = client.get(reverse(url_name))
+
+    request = APIRequestFactory().get(reverse(url_name))
+    serializer_class = getattr(serializers, serializer_name)
+    expected = serializer_class(User.objects.filter(type=user_type), many=True, context={"request": request}).data
+    assert resp.json() == [dict(item) for item in expected]
+    file_url = next(p["file"] for p in resp.json() if p["username"] == f"{user_type}1")
+    assert file_url.startswith("http://testserver/") and file_url.endswith("user_files/avatar.png")
+
+def test_login_reuses_existing_token_and_creates_missing_one():
+    pw = "login-pass-123"
+    user = create_user("tokenuser", password=pw)
+    existing = get_token_for(user)
+    client = APIClient()
+    url = reverse("login")
+    assert client.post(url, {"username": "tokenuser", "password": pw}, format="json").json()["token"] == existing
+
+    Token.objects.filter(user=user).delete()
+    new_key = client.post(url, {"username": "tokenuser", "password": pw}, format="json").json()["token"]
+    assert new_key == Token.objects.get(user=user).key
+
+def test_registration_writes_profile_in_single_statement():
+    payload = {
+        "username": "singlewrite",
+        "email": "singlewrite@example.com",
+        "password": "verysecure123",
+        "repeated_password": "verysecure123",
+        "type": "customer",
+    }
+    with CaptureQueriesContext(connection) as ctx:
+        resp = APIClient().post(reverse("registration"), payload, format="json")
+    assert resp.status_code == 201
+    profile_writes = [q["sql"] for q in ctx.captured_queries if "user_auth_app_userprofile" in q["sql"] and not q["sql"].startswith("SELECT")]
+    assert len(profile_writes) == 1
+    user = User.objects.get(username="singlewrite")
+    assert user.id == user.pk == resp.json()["user_id"]
+
+def test_login_loads_only_authentication_columns(django_assert_num_queries):
+    pw = "login-pass-123"
+    create_user("narrowlogin", password=pw, description="A long profile text")
+    with django_assert_num_queries(2) as captured:
+        resp = APIClient().post(reverse("login"), {"username": "narrowlogin", "password": pw}, format="json")
+    assert resp.status_code == 200
+    assert resp.json()["username"] == "narrowlogin"
+    assert '"description"' not in captured.captured_queries[0]["sql"]
+    assert not User.objects.get_by_natural_key("narrowlogin").get_deferred_fields()
+
+def test_user_detail_rejects_oversized_upload_before_parsing():
+    owner = create_user("bigupload")
+    client = APIClient()
+    client.force_authenticate(user=owner)
+    url = reverse("userprofile-detail", args=[owner.user])
+    resp = client.patch(url, {"location": "Kiel"}, format="json", CONTENT_LENGTH=str(MAX_PROFILE_BODY_SIZE + 1))
+    assert resp.status_code == 413
+    assert resp.json() == {"error": f"File too large. Size should not exceed {MAX_FILE_SIZE_MB} MB."}
+    owner.refresh_from_db()
+    assert owner.location is None
+
+def test_user_detail_accepts_put_with_maximum_size_file(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    owner = create_user("maxupload")
+    client = APIClient()
+    client.force_authenticate(user=owner)
+    url = reverse("userprofile-detail", args=[owner.user])
+    upload = SimpleUploadedFile("avatar.png", b"\0" * MAX_FILE_SIZE)
+    resp = client.put(url, {"username": "maxupload", "email": "maxupload@example.com", "type": "customer", "file": upload}, format="multipart")
+    assert resp.status_code == 200
+    owner.refresh_from_db()
+    assert owner.file.size == MAX_FILE_SIZE
+
+def test_user_detail_ignores_malformed_content_length():
+    owner = create_user("badlength")
+    client = APIClient()
+    client.force_authenticate(user=owner)
+    url = reverse("userprofile-detail", args=[owner.user])
+    resp = client.patch(url, {"location": "Kiel"}, format="json", CONTENT_LENGTH="not-a-number")
+    assert resp.status_code == 200
+
+def test_registration_accepts_username_with_spaces():
+    payload = {
+        "username": "John Doe",
+        "email": "john.doe@example.com",
+        "password": "verysecure123",
+        "repeated_password": "verysecure123",
+        "type": "customer",
+    }
+    resp = APIClient().post(reverse("registration"), payload, format="json")
+    assert resp.status_code == 201
+    assert resp.json()["username"] == "John Doe"
@@ -1,7 +1,9 @@
 from django.core.exceptions import ValidationError
 
+MAX_FILE_SIZE_MB = 5
+MAX_FILE_SIZE = MAX_FILE_SIZE_MB * 1024 * 1024
+
 def validate_file_size(value):
     """Validate that the uploaded file size does not exceed 5 MB."""
-    max_mb = 5
-    if value.size > max_mb * 1024 * 1024:
-        raise ValidationError(f"File too large. Size should not exceed {max_mb} MB.")
\ No newline at end of file
+    if value.size > MAX_FILE_SIZE:
+        raise ValidationError(f"File too large. Size should not exceed {MAX_FILE_SIZE_MB} MB.")